@@ -0,0 +1,123 @@
+"""Load test for the stateless API: requests/sec and latency percentiles.
+
+Each simulated user starts a session and answers random questions until the
+questionnaire finishes, then fetches the result. By default requests go straight to
+the ASGI app in-process (measures handler cost); with ``--url`` they go over HTTP to
+a running server, e.g. ``uvicorn chakra_insight.api:app --workers 4``.
+
+    python benchmarks/api_load.py --users 500 --concurrency 32
+    python benchmarks/api_load.py --url http://127.0.0.1:8000 --users 500
+"""
+import argparse
+import asyncio
+import http.client
+import json
+import os
+import random
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlencode, urlsplit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("CHAKRA_TOKEN_SECRET", "load-test")
+
+ANSWERS = ("Yes", "No", "Not sure")
+
+
+class InProcessClient:
+    def __init__(self):
+        from chakra_insight.api import app
+
+        self.app = app
+
+    async def request(self, method, path, query=None, body=None):
+        data = json.dumps(body).encode() if body is not None else b""
+        scope = {"type": "http", "method": method, "path": path,
+                 "query_string": urlencode(query or {}).encode()}
+        sent = []
+
+        async def receive():
+            return {"type": "http.request", "body": data, "more_body": False}
+
+        async def send(message):
+            sent.append(message)
+
+        await self.app(scope, receive, send)
+        return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+class HttpClient:
+    def __init__(self, url, concurrency):
+        parts = urlsplit(url)
+        self.host, self.port = parts.hostname, parts.port or 80
+        self.pool = ThreadPoolExecutor(concurrency)
+
+    def _do(self, method, path, query, body):
+        conn = http.client.HTTPConnection(self.host, self.port, timeout=30)
+        try:
+            target = path + ("?" + urlencode(query) if query else "")
+            payload = json.dumps(body) if body is not None else None
+            conn.request(method, target, payload, {"content-type": "application/json"})
+            resp = conn.getresponse()
+            return resp.status, json.loads(resp.read())
+        finally:
+            conn.close()
+
+    async def request(self, method, path, query=None, body=None):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, self._do, method, path, query, body)
+
+
+async def user_session(client, rnd, latencies):
+    async def call(*args, **kwargs):
+        t = time.perf_counter()
+        status, body = await client.request(*args, **kwargs)
+        latencies.append(time.perf_counter() - t)
+        if status != 200:
+            raise RuntimeError(f"{args[1]} -> {status}: {body}")
+        return body
+
+    state = await call("GET", "/next")
+    while not state["done"]:
+        state = await call("POST", "/answer", body={"token": state["token"], "answer": rnd.choice(ANSWERS)})
+    await call("GET", "/result", query={"token": state["token"]})
+
+
+async def run(client, users, concurrency, seed):
+    latencies = []
+    sem = asyncio.Semaphore(concurrency)
+    rnd = random.Random(seed)
+
+    async def one(i):
+        async with sem:
+            await user_session(client, random.Random(rnd.random() + i), latencies)
+
+    t0 = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(users)))
+    return latencies, time.perf_counter() - t0
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--url", help="base URL of a running server (default: in-process)")
+    ap.add_argument("--users", type=int, default=300)
+    ap.add_argument("--concurrency", type=int, default=32)
+    ap.add_argument("--seed", type=int, default=0)
+    args = ap.parse_args(argv)
+
+    client = HttpClient(args.url, args.concurrency) if args.url else InProcessClient()
+    latencies, seconds = asyncio.run(run(client, args.users, args.concurrency, args.seed))
+    lat = sorted(latencies)
+    p = lambda q: lat[min(len(lat) - 1, int(q * len(lat)))] * 1000
+    print(f"{len(lat):,} requests from {args.users} users in {seconds:.2f}s "
+          f"({'HTTP ' + args.url if args.url else 'in-process'})")
+    print(f"throughput: {len(lat) / seconds:,.0f} req/s")
+    print(f"latency ms: p50 {p(0.50):.2f}  p90 {p(0.90):.2f}  p99 {p(0.99):.2f}  "
+          f"mean {statistics.mean(lat) * 1000:.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Per-answer latency of the Streamlit app, driven headlessly through ``AppTest``.
+
+Clicks through whole sessions (cycling Yes / No / Not sure) and reports the median and
+p90 time from click to finished rerun. ``AppTest`` always reruns the full script, so
+this is an upper bound: in a browser an answer reruns only the question fragment.
+Uses ``$CHAKRA_LOGO`` (or the cached logo) so no download is timed.
+
+    python benchmarks/app_rerun.py --sessions 5
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ANSWERS = ("Yes", "No", "Not sure")
+
+
+def run_session(at, times):
+    for i in range(100):
+        buttons = [b for b in at.button if b.label in ANSWERS]
+        if not buttons:
+            return
+        button = next(b for b in buttons if b.label == ANSWERS[i % 3])
+        t = time.perf_counter()
+        button.click().run()
+        times.append(time.perf_counter() - t)
+        if at.exception:
+            raise SystemExit(f"app raised: {at.exception}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    from streamlit.testing.v1 import AppTest
+
+    times = []
+    for _ in range(args.sessions):
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.run()
+        run_session(at, times)
+    times.sort()
+    print(f"{len(times)} answers: median {statistics.median(times) * 1000:.1f} ms, "
+          f"p90 {times[int(len(times) * 0.9)] * 1000:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,58 @@
+"""Per-report PDF render time, with and without the per-chakra templates.
+
+"untemplated" clears ``chakra_template`` before every report, so every guidance
+paragraph is re-flowed (what each report cost before templates); "templated" reuses
+the pre-flowed fragments. Runs offline against a generated placeholder logo.
+
+    python benchmarks/pdf_render.py --reports 200
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def placeholder_logo(directory: str) -> str:
+    from PIL import Image
+
+    path = os.path.join(directory, "logo.png")
+    Image.new("RGB", (320, 120), (142, 36, 170)).save(path)
+    return path
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--reports", type=int, default=200)
+    args = ap.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        os.environ["CHAKRA_LOGO"] = placeholder_logo(tmp)
+        from chakra_insight.engine import ANSWERS, QUESTION_IDS
+        from chakra_insight.insight import score_session
+        from chakra_insight.report import chakra_template, render_report
+
+        sessions = []
+        for i in range(args.reports):
+            answers = [(qid, ANSWERS[(i + j) % 3]) for j, qid in enumerate(QUESTION_IDS)]
+            sessions.append(score_session(answers)["posterior"])
+        render_report(sessions[0], "Warm Up", "warm@example.com", "1990-01-01")
+
+        results = {}
+        for mode in ("untemplated", "templated"):
+            t0 = time.perf_counter()
+            for i, posterior in enumerate(sessions):
+                if mode == "untemplated":
+                    chakra_template.cache_clear()
+                render_report(posterior, f"User {i}", f"user{i}@example.com", "1990-01-01")
+            results[mode] = (time.perf_counter() - t0) / len(sessions) * 1000
+            print(f"{mode:>12}: {results[mode]:.2f} ms/report")
+    cut = 1 - results["templated"] / results["untemplated"]
+    print(f"{'saving':>12}: {cut:.0%}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
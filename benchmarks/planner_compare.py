@@ -0,0 +1,74 @@
+"""Average questions-to-threshold: lookahead planner vs. the greedy policy.
+
+Synthetic respondents are drawn from ``LIKELIHOODS`` (uniform true chakra, a fixed
+"Not sure" rate); both policies answer the same respondents.
+
+    python benchmarks/planner_compare.py --respondents 300 --depth 3 --budget-ms 50
+    python benchmarks/planner_compare.py --threshold 0.6
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chakra_insight import engine  # noqa: E402
+from chakra_insight.engine import NO, STOP_THRESHOLD, UNSURE, YES  # noqa: E402
+from chakra_insight.planner import Planner  # noqa: E402
+
+
+def run(choose, truths, draws, unsure_draws, unsure_rate, threshold=STOP_THRESHOLD):
+    asked_counts, reached, correct, think = [], 0, 0, 0.0
+    for truth, u, d in zip(truths, draws, unsure_draws):
+        p, asked, history = engine.uniform_vector(), [], []
+        while p.max() < threshold and len(asked) < len(engine.QUESTION_IDS):
+            t = time.perf_counter()
+            q = choose(p, asked, history)
+            think += time.perf_counter() - t
+            code = UNSURE if d[q] < unsure_rate else (YES if u[q] < engine.LIKE[truth, q] else NO)
+            asked.append(q)
+            history.append((q, code))
+            p = engine.update_vector(p, q, code)
+        asked_counts.append(len(asked))
+        reached += p.max() >= threshold
+        correct += int(p.argmax()) == truth
+    n = len(truths)
+    return {"avg_questions": float(np.mean(asked_counts)), "reached": reached / n,
+            "accuracy": correct / n, "ms_per_decision": think / max(sum(asked_counts), 1) * 1000}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--respondents", type=int, default=300)
+    ap.add_argument("--depth", type=int, default=3)
+    ap.add_argument("--beam", type=int, default=4)
+    ap.add_argument("--budget-ms", type=float, default=50.0)
+    ap.add_argument("--unsure-rate", type=float, default=0.05)
+    ap.add_argument("--seed", type=int, default=0)
+    ap.add_argument("--threshold", type=float, default=STOP_THRESHOLD)
+    args = ap.parse_args(argv)
+
+    rng = np.random.default_rng(args.seed)
+    n, nq = args.respondents, len(engine.QUESTION_IDS)
+    truths = rng.integers(len(engine.LIKE), size=n)
+    draws, unsure_draws = rng.random((n, nq)), rng.random((n, nq))
+
+    planner = Planner(depth=args.depth, beam=args.beam, budget_s=args.budget_ms / 1000,
+                      stop_threshold=args.threshold)
+    policies = {
+        "greedy": lambda p, asked, history: engine.best_question(p, asked),
+        f"planner(k={args.depth},beam={args.beam})": planner.choose,
+    }
+    print(f"{n} respondents, 'Not sure' rate {args.unsure_rate:.0%}, threshold {args.threshold}")
+    for label, choose in policies.items():
+        r = run(choose, truths, draws, unsure_draws, args.unsure_rate, args.threshold)
+        print(f"{label:>24}: {r['avg_questions']:.2f} questions, reached {r['reached']:.1%}, "
+              f"accuracy {r['accuracy']:.1%}, {r['ms_per_decision']:.2f} ms/decision")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
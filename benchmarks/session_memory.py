@@ -0,0 +1,108 @@
+"""Memory and rerun cost as concurrent Streamlit sessions pile up.
+
+Opens N app sessions with ``AppTest`` and keeps them all alive, answering a few
+questions in each. Reports the process RSS growth per session and the rerun time of the
+first and last sessions; with a shared engine both should stay flat as N grows.
+``--state-only`` skips Streamlit and compares N compact ``SessionState`` objects with N
+of the old dict/list/dict session states.
+
+    python benchmarks/session_memory.py --sessions 200 --answers 6
+    python benchmarks/session_memory.py --state-only --sessions 100000
+"""
+import argparse
+import gc
+import os
+import statistics
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+ANSWERS = ("Yes", "No", "Not sure")
+
+
+def rss_mb() -> float:
+    with open("/proc/self/statm") as fh:
+        return int(fh.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+
+
+def app_sessions(n: int, answers: int) -> None:
+    from streamlit.testing.v1 import AppTest
+
+    def open_session():
+        at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=60)
+        at.run()
+        times = []
+        for i in range(answers):
+            button = next(b for b in at.button if b.label == ANSWERS[i % 3])
+            t = time.perf_counter()
+            button.click().run()
+            times.append(time.perf_counter() - t)
+        return at, statistics.median(times)
+
+    kept = [open_session()]           # warm-up: imports, engine, policy
+    gc.collect()
+    base = rss_mb()
+    for _ in range(n - 1):
+        kept.append(open_session())
+    gc.collect()
+    grown = rss_mb() - base
+    k = max(1, n // 10)
+    first = statistics.median(t for _, t in kept[1:k + 1]) * 1000
+    last = statistics.median(t for _, t in kept[-k:]) * 1000
+    print(f"{n} sessions x {answers} answers: RSS +{grown:.1f} MB ({grown * 1000 / max(n - 1, 1):.1f} kB/session), "
+          f"rerun median first {k}: {first:.1f} ms, last {k}: {last:.1f} ms")
+
+
+def state_only(n: int, answers: int) -> None:
+    from chakra_insight.engine import normalize, update_posterior
+    from chakra_insight.knowledge import CHAKRAS
+    from chakra_insight.session import Engine
+
+    engine = Engine()
+
+    template = engine.new_session()
+    for i in range(answers):
+        engine.answer(template, engine.next_question(template), ANSWERS[i % 3])
+    legacy_answers = dict(engine.history(template))
+
+    def compact():
+        s = engine.new_session()
+        for qid, a in legacy_answers.items():
+            engine.answer(s, engine.question_index[qid], a)
+        return s
+
+    def legacy():
+        post = normalize({c: 1.0 for c in CHAKRAS})
+        for qid, a in legacy_answers.items():
+            post = update_posterior(post, qid, a)
+        return {"posterior": post, "asked": list(legacy_answers), "answers": dict(legacy_answers)}
+
+    for label, make in (("compact", compact), ("legacy", legacy)):
+        gc.collect()
+        base = rss_mb()
+        t = time.perf_counter()
+        kept = [make() for _ in range(n)]
+        seconds = time.perf_counter() - t
+        gc.collect()
+        grown = rss_mb() - base
+        print(f"{label:>8}: {n:,} states, RSS +{grown:.1f} MB ({grown * 1e6 / n:.0f} B/session), "
+              f"{seconds / n * 1e6:.0f} us to build each")
+        del kept
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=100)
+    parser.add_argument("--answers", type=int, default=6)
+    parser.add_argument("--state-only", action="store_true")
+    args = parser.parse_args(argv)
+    if args.state_only:
+        state_only(args.sessions, args.answers)
+    else:
+        app_sessions(args.sessions, args.answers)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
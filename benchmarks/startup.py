@@ -0,0 +1,57 @@
+"""Cold-start import budget for the headless engine.
+
+Imports the scoring API in fresh interpreters, reports the median wall time and fails
+(exit 1) when it exceeds the budget or when a UI/report dependency got pulled in.
+
+    python benchmarks/startup.py --budget-ms 250
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("streamlit", "reportlab", "matplotlib", "pandas")
+
+PROBE = """
+import json, sys, time
+t = time.perf_counter()
+from chakra_insight import score_session, choose_next_question, update_posterior, chakra_from_birth, make_summary
+dt = time.perf_counter() - t
+print(json.dumps({"seconds": dt, "heavy": [m for m in %r if m in sys.modules]}))
+""" % (HEAVY,)
+
+
+def measure(runs: int):
+    times, heavy = [], set()
+    for _ in range(runs):
+        out = subprocess.run([sys.executable, "-c", PROBE], cwd=ROOT, check=True,
+                             capture_output=True, text=True).stdout
+        res = json.loads(out)
+        times.append(res["seconds"])
+        heavy.update(res["heavy"])
+    return times, sorted(heavy)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--runs", type=int, default=7)
+    ap.add_argument("--budget-ms", type=float, default=250.0)
+    args = ap.parse_args(argv)
+    times, heavy = measure(args.runs)
+    median_ms = statistics.median(times) * 1000
+    print(f"import chakra_insight scoring API: median {median_ms:.1f} ms, "
+          f"min {min(times)*1000:.1f} ms over {args.runs} runs (budget {args.budget_ms:.0f} ms)")
+    if heavy:
+        print(f"FAIL: heavy modules imported: {', '.join(heavy)}")
+        return 1
+    if median_ms > args.budget_ms:
+        print("FAIL: over budget")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
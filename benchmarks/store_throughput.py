@@ -0,0 +1,82 @@
+"""Throughput of the SQLite session store.
+
+Several producer threads (standing in for Streamlit sessions) submit completed-session
+records to one ``SessionStore`` in a temporary database. Reports submit latency, the
+sustained sessions/sec through to commit, and checks that every row landed.
+
+    python benchmarks/store_throughput.py --sessions 50000 --producers 8
+"""
+import argparse
+import os
+import random
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chakra_insight.engine import ANSWERS, QUESTION_IDS  # noqa: E402
+from chakra_insight.insight import score_session  # noqa: E402
+from chakra_insight.store import SessionStore, make_record  # noqa: E402
+
+
+def sample_records(n: int, seed: int = 0):
+    rng = random.Random(seed)
+    records = []
+    for i in range(n):
+        answers = [(q, rng.choice(ANSWERS)) for q in rng.sample(QUESTION_IDS, rng.randint(5, len(QUESTION_IDS)))]
+        posterior = score_session(answers)["posterior"]
+        records.append(make_record(answers, posterior, f"User {i}", f"user{i}@example.com", "", "1990-01-01"))
+    return records
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=50_000)
+    parser.add_argument("--producers", type=int, default=8)
+    parser.add_argument("--batch-size", type=int, default=500)
+    parser.add_argument("--max-queue", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    distinct = sample_records(min(args.sessions, 2_000))
+    per_producer = args.sessions // args.producers
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "sessions.db")
+        store = SessionStore(path, batch_size=args.batch_size, max_queue=args.max_queue)
+        latencies = [[] for _ in range(args.producers)]
+
+        def produce(k):
+            lat = latencies[k]
+            for i in range(per_producer):
+                t = time.perf_counter()
+                store.submit(distinct[(k * per_producer + i) % len(distinct)], timeout=None)
+                lat.append(time.perf_counter() - t)
+
+        t0 = time.perf_counter()
+        threads = [threading.Thread(target=produce, args=(k,)) for k in range(args.producers)]
+        for th in threads:
+            th.start()
+        for th in threads:
+            th.join()
+        store.flush()
+        seconds = time.perf_counter() - t0
+        store.close()
+
+        total = per_producer * args.producers
+        rows = sqlite3.connect(path).execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+        lat = sorted(x for part in latencies for x in part)
+        print(f"{total:,} sessions from {args.producers} producers in {seconds:.2f}s: "
+              f"{total / seconds:,.0f} sessions/s committed")
+        print(f"submit latency median {statistics.median(lat) * 1e6:.1f} us, "
+              f"p99 {lat[int(len(lat) * 0.99)] * 1e6:.1f} us, max {lat[-1] * 1e3:.2f} ms")
+        if rows != total or store.dropped:
+            print(f"FAIL: {rows:,} rows stored, {store.dropped} dropped", file=sys.stderr)
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
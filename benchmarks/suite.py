@@ -0,0 +1,215 @@
+"""Repeatable benchmark suite with JSON output and a regression check.
+
+Microbenchmarks of the dict API the app calls (``entropy``, ``expected_information_gain``,
+``choose_next_question``, ``update_posterior``) run on the built-in 14-question bank
+and on synthetic banks of 100 and 1,000 questions. Each bank size runs in its own
+interpreter with ``CHAKRA_BANK`` pointing at a compiled bank. The suite also times
+end-to-end greedy sessions (``session.Engine``) and ``render_report`` /
+``generate_pdf`` with a placeholder logo, offline.
+
+    python benchmarks/suite.py -o bench.json
+    python benchmarks/suite.py --compare bench.json --tolerance 0.25
+
+With ``--compare``, every benchmark that got slower than the baseline by more than the
+tolerance is listed and the exit status is 1. The comparison uses the best round
+(``--stat min``) by default, since it is far less noisy than the median on shared hosts.
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+sys.path.insert(0, ROOT)
+
+SIZES = (14, 100, 1000)
+SEED = 1234
+
+
+def measure(fn, min_time: float, repeat: int = 5) -> dict:
+    """Median / min seconds per call over ``repeat`` rounds of an auto-sized loop."""
+    loops = 1
+    while True:
+        t = timeit.timeit(fn, number=loops)
+        if t >= min_time / repeat or loops >= 1 << 20:
+            break
+        loops *= 2 if t <= 0 else max(2, min(10, int(min_time / repeat / t) + 1))
+    rounds = [timeit.timeit(fn, number=loops) / loops for _ in range(repeat)]
+    return {"median_us": statistics.median(rounds) * 1e6, "min_us": min(rounds) * 1e6, "loops": loops}
+
+
+# -----------------------------
+# Worker (runs inside one bank)
+# -----------------------------
+def run_worker(size: int, min_time: float, pdf: bool) -> dict:
+    import random
+
+    from chakra_insight import engine
+    from chakra_insight.engine import (ANSWERS, choose_next_question, entropy, expected_information_gain,
+                                       update_posterior)
+    from chakra_insight.session import Engine
+
+    rng = random.Random(SEED)
+    n_questions = len(engine.QUESTION_IDS)
+    assert n_questions == size, f"bank has {n_questions} questions, expected {size}"
+    # A mid-session state: a third of the bank answered.
+    posterior = engine.to_dict(engine.uniform_vector())
+    asked = set()
+    for qid in rng.sample(engine.QUESTION_IDS, max(1, n_questions // 3)):
+        posterior = update_posterior(posterior, qid, rng.choice(ANSWERS[:2]))
+        asked.add(qid)
+    candidate = next(q for q in engine.QUESTION_IDS if q not in asked)
+
+    prefix = f"bank{size}"
+    results = {
+        f"{prefix}.entropy": measure(lambda: entropy(posterior), min_time),
+        f"{prefix}.expected_information_gain": measure(lambda: expected_information_gain(posterior, candidate), min_time),
+        f"{prefix}.choose_next_question": measure(lambda: choose_next_question(asked, posterior), min_time),
+        f"{prefix}.update_posterior": measure(lambda: update_posterior(posterior, candidate, "Yes"), min_time),
+    }
+
+    quiz = Engine()
+    like = engine.LIKE
+    sessions = [(rng.randrange(len(like)), random.Random(SEED + i)) for i in range(64)]
+
+    def one_session(it=iter(range(1 << 30))):
+        truth, srng = sessions[next(it) % len(sessions)]
+        s = quiz.new_session()
+        while True:
+            q = quiz.next_question(s)
+            if q is None:
+                return
+            quiz.answer(s, q, "Yes" if srng.random() < like[truth, q] else "No")
+
+    results[f"{prefix}.session"] = measure(one_session, min_time)
+
+    if pdf:
+        from chakra_insight.insight import score_session
+        from chakra_insight.report import render_report
+
+        answers = [(qid, ANSWERS[j % 3]) for j, qid in enumerate(engine.QUESTION_IDS)]
+        final = score_session(answers)["posterior"]
+        results["pdf.render_report"] = measure(
+            lambda: render_report(final, "Bench User", "bench@example.com", "1990-01-01"), min_time * 2)
+    return results
+
+
+# -----------------------------
+# Orchestration
+# -----------------------------
+def synthetic_bank(size: int, path: str) -> None:
+    import numpy as np
+
+    from chakra_insight.bank import builtin_source, compile_bank
+
+    src = builtin_source()
+    rng = np.random.default_rng(SEED + size)
+    src["name"] = f"synthetic-{size}"
+    src["questions"] = [{"id": f"q{i:04d}", "text": f"Synthetic question {i}?"} for i in range(size)]
+    like = rng.beta(0.7, 0.7, size=(len(src["chakras"]), size)).clip(0.02, 0.98).round(3)
+    src["likelihoods"] = {c: {q["id"]: float(p) for q, p in zip(src["questions"], row)}
+                          for c, row in zip(src["chakras"], like)}
+    compile_bank(src, path)
+
+
+def run_suite(sizes, min_time: float, tmp: str) -> dict:
+    from pdf_render import placeholder_logo
+
+    logo = placeholder_logo(tmp)
+    results = {}
+    for size in sizes:
+        env = dict(os.environ, CHAKRA_OFFLINE="1", CHAKRA_LOGO=logo, PYTHONHASHSEED="0")
+        env.pop("CHAKRA_METRICS", None)
+        env.pop("CHAKRA_LIKELIHOODS", None)
+        if size == 14:
+            env.pop("CHAKRA_BANK", None)
+        else:
+            env["CHAKRA_BANK"] = os.path.join(tmp, f"bank{size}.ckb")
+            synthetic_bank(size, env["CHAKRA_BANK"])
+        cmd = [sys.executable, os.path.abspath(__file__), "--worker", str(size), "--min-time", str(min_time)]
+        if size == 14:
+            cmd.append("--pdf")
+        t0 = time.perf_counter()
+        out = subprocess.run(cmd, env=env, cwd=ROOT, check=True, capture_output=True, text=True).stdout
+        results.update(json.loads(out))
+        print(f"bank of {size} questions done in {time.perf_counter() - t0:.1f}s", file=sys.stderr)
+    return results
+
+
+def meta() -> dict:
+    import numpy as np
+
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT, capture_output=True,
+                                text=True).stdout.strip() or None
+    except OSError:
+        commit = None
+    return {"python": platform.python_version(), "numpy": np.__version__, "machine": platform.machine(),
+            "platform": platform.platform(), "cpus": os.cpu_count(), "commit": commit,
+            "time": time.strftime("%Y-%m-%dT%H:%M:%S")}
+
+
+def compare(current: dict, baseline: dict, tolerance: float, stat: str = "min") -> int:
+    """Print a comparison table; returns the number of regressions."""
+    regressions = 0
+    print(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name in sorted(set(current) | set(baseline)):
+        if name not in current or name not in baseline:
+            print(f"{name:<40}{'(only in ' + ('current' if name in current else 'baseline') + ')':>33}")
+            continue
+        old, new = baseline[name][f"{stat}_us"], current[name][f"{stat}_us"]
+        change = new / old - 1 if old else 0.0
+        flag = ""
+        if change > tolerance:
+            regressions += 1
+            flag = "  <-- REGRESSION"
+        print(f"{name:<40}{old:>10.1f}us{new:>10.1f}us{change:>+9.0%}{flag}")
+    return regressions
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("-o", "--output", help="write results JSON here")
+    ap.add_argument("--compare", metavar="BASELINE", help="fail if slower than this results JSON")
+    ap.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown (default: 0.25 = 25%%)")
+    ap.add_argument("--stat", choices=("min", "median"), default="min", help="statistic compared (default: min)")
+    ap.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    ap.add_argument("--min-time", type=float, default=0.5, help="seconds per benchmark (default: 0.5)")
+    ap.add_argument("--worker", type=int, help=argparse.SUPPRESS)
+    ap.add_argument("--pdf", action="store_true", help=argparse.SUPPRESS)
+    args = ap.parse_args(argv)
+
+    if args.worker is not None:
+        print(json.dumps(run_worker(args.worker, args.min_time, args.pdf)))
+        return 0
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = run_suite(args.sizes, args.min_time, tmp)
+    report = {"meta": meta(), "results": results}
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(report, fh, indent=2)
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        regressions = compare(results, baseline["results"], args.tolerance, args.stat)
+        if regressions:
+            print(f"FAIL: {regressions} benchmark(s) regressed by more than {args.tolerance:.0%} "
+                  f"against {args.compare} ({baseline['meta'].get('commit')})", file=sys.stderr)
+            return 1
+        print(f"OK: no regressions beyond {args.tolerance:.0%}")
+    else:
+        for name, r in sorted(results.items()):
+            print(f"{name:<40}{r['median_us']:>12.1f} us median{r['min_us']:>12.1f} us min")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
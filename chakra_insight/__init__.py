@@ -0,0 +1,32 @@
+"""Chakra Insight — Bayesian 20-questions engine shared by the Streamlit app and tools.
+
+Importing the package is cheap: submodules (and NumPy) load on first attribute access,
+and nothing here pulls in streamlit, reportlab, matplotlib or pandas.
+"""
+import importlib
+
+_EXPORTS = {
+    "CHAKRAS": "knowledge",
+    "QUESTIONS": "knowledge",
+    "LIKELIHOODS": "knowledge",
+    "REMEDIES": "knowledge",
+    "normalize": "engine",
+    "entropy": "engine",
+    "expected_information_gain": "engine",
+    "choose_next_question": "engine",
+    "update_posterior": "engine",
+    "chakra_from_birth": "insight",
+    "make_summary": "insight",
+    "score_session": "insight",
+}
+
+__all__ = sorted(_EXPORTS)
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
@@ -0,0 +1,164 @@
+"""Incremental rollups over the stored session history, for the analytics page.
+
+A ``Rollup`` is a handful of small count arrays (winners, confidence histogram,
+questions asked, per-question answers, birth chakra × winner) plus a watermark: the
+highest session id already counted. ``refresh`` reads only rows above the watermark,
+in chunks, folds each chunk in with vectorized NumPy, and saves the rollup next to the
+database (``<db>.rollup.npz``). Opening the dashboard therefore costs one ``MAX(id)``
+lookup plus whatever arrived since the last visit, however long the history is.
+"""
+import json
+import os
+from typing import Dict, Optional
+
+import numpy as np
+
+from . import engine
+from .engine import ANSWERS, STOP_THRESHOLD
+from .knowledge import CHAKRAS
+
+DEFAULT_CHUNKSIZE = 50_000
+CONFIDENCE_BINS = 20              # over [0, 1]
+
+
+def rollup_path(db_path: str) -> str:
+    return f"{db_path}.rollup.npz"
+
+
+def latest_id(db_path: str) -> int:
+    """Highest stored session id (0 when empty); a primary-key lookup, not a scan."""
+    from .store import connect
+
+    conn = connect(db_path)
+    try:
+        return conn.execute("SELECT COALESCE(MAX(id), 0) FROM sessions").fetchone()[0]
+    finally:
+        conn.close()
+
+
+class Rollup:
+    """Aggregate counts of every session with ``id <= watermark``."""
+
+    ARRAYS = ("winners", "confidence", "questions", "reached", "answers", "birth", "no_dob")
+
+    def __init__(self):
+        n_c, n_q = len(CHAKRAS), len(engine.QUESTION_IDS)
+        self.watermark = 0
+        self.sessions = 0
+        self.winners = np.zeros(n_c, dtype=np.int64)
+        self.confidence = np.zeros(CONFIDENCE_BINS, dtype=np.int64)
+        self.questions = np.zeros(n_q + 1, dtype=np.int64)         # sessions by questions asked
+        self.reached = np.zeros(n_q + 1, dtype=np.int64)           # ... that reached the threshold
+        self.answers = np.zeros((n_q, len(ANSWERS)), dtype=np.int64)
+        self.birth = np.zeros((n_c, n_c), dtype=np.int64)          # birth chakra × winner
+        self.no_dob = np.zeros(n_c, dtype=np.int64)                # winners of sessions without a DOB
+
+    # -----------------------------
+    # Persistence
+    # -----------------------------
+    @classmethod
+    def load(cls, path: str) -> "Rollup":
+        """Saved rollup, or an empty one if missing or built for another bank."""
+        r = cls()
+        try:
+            with np.load(path) as data:
+                if (data["chakras"].tolist() != list(CHAKRAS)
+                        or data["question_ids"].tolist() != list(engine.QUESTION_IDS)):
+                    return r
+                for name in cls.ARRAYS:
+                    if data[name].shape != getattr(r, name).shape:
+                        return r
+                for name in cls.ARRAYS:
+                    setattr(r, name, data[name].astype(np.int64))
+                r.watermark, r.sessions = int(data["watermark"]), int(data["sessions"])
+        except (OSError, KeyError, ValueError):
+            pass
+        return r
+
+    def save(self, path: str) -> None:
+        tmp = f"{path}.{os.getpid()}.tmp.npz"
+        np.savez(tmp, watermark=self.watermark, sessions=self.sessions,
+                 chakras=np.array(CHAKRAS), question_ids=np.array(engine.QUESTION_IDS),
+                 **{name: getattr(self, name) for name in self.ARRAYS})
+        os.replace(tmp, path)
+
+    # -----------------------------
+    # Folding in sessions
+    # -----------------------------
+    def add(self, ids, dobs, answers, winners, confidences, counts) -> None:
+        """Fold in one chunk of sessions (parallel sequences, ids ascending)."""
+        from .batch import encode_pairs
+
+        if not len(ids):
+            return
+        index = {c: i for i, c in enumerate(CHAKRAS)}
+        win = np.array([index.get(w, -1) for w in winners], dtype=np.int64)
+        conf = np.asarray(confidences, dtype=np.float64)
+        n_asked = np.clip(np.asarray(counts, dtype=np.int64), 0, len(engine.QUESTION_IDS))
+        known = win >= 0
+
+        self.winners += np.bincount(win[known], minlength=len(CHAKRAS))
+        bins = np.clip((conf * CONFIDENCE_BINS).astype(np.int64), 0, CONFIDENCE_BINS - 1)
+        self.confidence += np.bincount(bins, minlength=CONFIDENCE_BINS)
+        self.questions += np.bincount(n_asked, minlength=len(self.questions))
+        self.reached += np.bincount(n_asked[conf >= STOP_THRESHOLD], minlength=len(self.reached))
+        codes = encode_pairs(answers, fill=-1)
+        for k in range(len(ANSWERS)):
+            self.answers[:, k] += (codes == k).sum(axis=0)
+
+        # Birth chakra from "YYYY-MM-DD": ((day + month) % 7 or 7) - 1, as chakra_from_birth.
+        has_dob = np.array([bool(d) and len(d) >= 10 for d in dobs])
+        day = np.array([int(d[8:10]) if h else 0 for d, h in zip(dobs, has_dob)], dtype=np.int64)
+        month = np.array([int(d[5:7]) if h else 0 for d, h in zip(dobs, has_dob)], dtype=np.int64)
+        birth = (day + month + 6) % 7
+        both = has_dob & known
+        np.add.at(self.birth, (birth[both], win[both]), 1)
+        self.no_dob += np.bincount(win[~has_dob & known], minlength=len(CHAKRAS))
+
+        self.sessions += len(ids)
+        self.watermark = int(ids[-1])
+
+    # -----------------------------
+    # Views
+    # -----------------------------
+    def summary(self) -> Dict:
+        with_dob = int(self.birth.sum())
+        reached = int(self.reached.sum())
+        asked = self.answers.sum(axis=1)
+        return {
+            "sessions": self.sessions,
+            "watermark": self.watermark,
+            "winners": dict(zip(CHAKRAS, self.winners.tolist())),
+            "reached_threshold": reached / self.sessions if self.sessions else 0.0,
+            "avg_questions_to_threshold": float((np.arange(len(self.reached)) * self.reached).sum() / reached)
+            if reached else None,
+            "answer_rates": {q: dict(zip(ANSWERS, (row / n).round(4).tolist())) if n else None
+                             for q, row, n in zip(engine.QUESTION_IDS, self.answers, asked)},
+            "birth_agreement": float(np.trace(self.birth) / with_dob) if with_dob else None,
+            "sessions_with_dob": with_dob,
+        }
+
+
+def refresh(db_path: str, chunksize: int = DEFAULT_CHUNKSIZE, upto: Optional[int] = None) -> Rollup:
+    """Bring the saved rollup for ``db_path`` up to date (up to id ``upto``) and return it."""
+    from .store import connect
+
+    path = rollup_path(db_path)
+    rollup = Rollup.load(path)
+    start = rollup.watermark
+    conn = connect(db_path)
+    try:
+        while upto is None or rollup.watermark < upto:
+            rows = conn.execute(
+                "SELECT id, dob, answers, winner, confidence, questions FROM sessions "
+                "WHERE id > ? AND id <= ? ORDER BY id LIMIT ?",
+                (rollup.watermark, upto if upto is not None else 2**62, chunksize)).fetchall()
+            if not rows:
+                break
+            ids, dobs, answers, winners, confs, counts = zip(*rows)
+            rollup.add(ids, dobs, [json.loads(a) for a in answers], winners, confs, counts)
+    finally:
+        conn.close()
+    if rollup.watermark != start:
+        rollup.save(path)
+    return rollup
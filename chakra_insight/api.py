@@ -0,0 +1,202 @@
+"""Stateless HTTP API for the 20Q engine (plain ASGI, no framework).
+
+The whole answer history travels in a signed token, so any worker can serve any
+request. Because question selection is deterministic, the history is just the answer
+codes in order — two bits per question — and the asked questions are recovered by
+replaying it through the compiled policy.
+
+    GET  /next?token=...            next question (no token = new session)
+    POST /answer  {"token", "answer"}  record an answer, returns the next question
+    GET  /result?token=...&name=&dob=  winner, confidence, posterior and summary
+    GET  /metrics                   Prometheus text format (with CHAKRA_METRICS=1)
+
+Run with any ASGI server, e.g. ``uvicorn chakra_insight.api:app --workers 4``. Set
+``CHAKRA_TOKEN_SECRET`` to the same value on every worker.
+"""
+import base64
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import struct
+import sys
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple
+from urllib.parse import parse_qs
+
+import numpy as np
+
+from . import engine, metrics
+from .engine import ANSWER_CODES, ANSWERS
+from .insight import score_session
+from .knowledge import QUESTIONS
+from .policy import PolicyTree, fingerprint, load_default
+
+TOKEN_VERSION = 1
+_HEADER = struct.Struct(">BH")   # version, number of answers
+_SIG_BYTES = 8
+
+
+class TokenError(ValueError):
+    pass
+
+
+# -----------------------------
+# Tokens
+# -----------------------------
+@lru_cache(maxsize=1)
+def _key() -> bytes:
+    secret = os.environ.get("CHAKRA_TOKEN_SECRET")
+    if not secret:
+        print("chakra_insight.api: CHAKRA_TOKEN_SECRET is not set; tokens only work on this "
+              "process", file=sys.stderr)
+        secret = secrets.token_hex(32)
+    # Bind tokens to the question bank, so a bank swap invalidates old histories.
+    return hmac.new(secret.encode(), fingerprint().encode(), hashlib.sha256).digest()
+
+
+def encode_token(codes: Sequence[int]) -> str:
+    packed = bytearray((len(codes) + 3) // 4)
+    for i, code in enumerate(codes):
+        packed[i // 4] |= code << (2 * (i % 4))
+    payload = _HEADER.pack(TOKEN_VERSION, len(codes)) + bytes(packed)
+    sig = hmac.new(_key(), payload, hashlib.sha256).digest()[:_SIG_BYTES]
+    return base64.urlsafe_b64encode(payload + sig).rstrip(b"=").decode()
+
+
+def decode_token(token: Optional[str]) -> List[int]:
+    if not token:
+        return []
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+    except ValueError as exc:
+        raise TokenError("malformed token") from exc
+    payload, sig = raw[:-_SIG_BYTES], raw[-_SIG_BYTES:]
+    if len(payload) < _HEADER.size:
+        raise TokenError("malformed token")
+    expected = hmac.new(_key(), payload, hashlib.sha256).digest()[:_SIG_BYTES]
+    if not hmac.compare_digest(sig, expected):
+        raise TokenError("bad token signature")
+    version, n = _HEADER.unpack_from(payload)
+    packed = payload[_HEADER.size:]
+    if version != TOKEN_VERSION or len(packed) != (n + 3) // 4:
+        raise TokenError("unsupported token")
+    codes = [(packed[i // 4] >> (2 * (i % 4))) & 3 for i in range(n)]
+    if any(c > 2 for c in codes):
+        raise TokenError("malformed token")
+    return codes
+
+
+# -----------------------------
+# Handlers
+# -----------------------------
+@lru_cache(maxsize=1)
+def policy() -> PolicyTree:
+    return load_default()
+
+
+def _state(codes: List[int]) -> Tuple[List[int], Optional[int], np.ndarray]:
+    try:
+        return policy().replay(codes)
+    except ValueError as exc:
+        raise TokenError(str(exc)) from exc
+
+
+def next_payload(codes: List[int]) -> Dict:
+    asked, nxt, p = _state(codes)
+    body = {"token": encode_token(codes), "done": nxt is None, "asked": len(asked),
+            "posterior": engine.to_dict(p)}
+    if nxt is not None:
+        q = QUESTIONS[nxt]
+        body["question"] = {"id": q["id"], "text": q["text"], "number": len(asked) + 1,
+                            "answers": list(ANSWERS)}
+    return body
+
+
+def answer_payload(token: str, answer: str) -> Dict:
+    if answer not in ANSWER_CODES:
+        raise TokenError(f"answer must be one of {', '.join(ANSWERS)}")
+    # Replaying one answer past a finished questionnaire is rejected by _state.
+    return next_payload(decode_token(token) + [ANSWER_CODES[answer]])
+
+
+def result_payload(token: str, name: str = "", dob: Optional[str] = None) -> Dict:
+    codes = decode_token(token)
+    asked, nxt, _ = _state(codes)
+    answers = [(engine.QUESTION_IDS[q], ANSWERS[c]) for q, c in zip(asked, codes)]
+    result = score_session(answers, name, dob)
+    result["done"] = nxt is None
+    return result
+
+
+# -----------------------------
+# ASGI
+# -----------------------------
+async def _read_json(receive) -> Dict:
+    chunks = []
+    while True:
+        message = await receive()
+        chunks.append(message.get("body", b""))
+        if not message.get("more_body"):
+            break
+    try:
+        data = json.loads(b"".join(chunks) or b"{}")
+    except ValueError as exc:
+        raise TokenError("request body must be JSON") from exc
+    if not isinstance(data, dict):
+        raise TokenError("request body must be a JSON object")
+    return data
+
+
+async def _send(send, status: int, data: bytes, content_type: bytes) -> None:
+    await send({"type": "http.response.start", "status": status,
+                "headers": [(b"content-type", content_type),
+                            (b"content-length", str(len(data)).encode())]})
+    await send({"type": "http.response.body", "body": data})
+
+
+async def _send_json(send, status: int, body: Dict) -> None:
+    await _send(send, status, json.dumps(body, ensure_ascii=False).encode(), b"application/json")
+
+
+async def app(scope, receive, send) -> None:
+    if scope["type"] == "lifespan":
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                policy()
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+    if scope["type"] != "http":
+        return
+    method, path = scope["method"], scope["path"]
+    query = {k: v[0] for k, v in parse_qs(scope.get("query_string", b"").decode()).items()}
+    try:
+        if method == "GET" and path == "/next":
+            with metrics.span("api_next"):
+                body = next_payload(decode_token(query.get("token")))
+        elif method == "POST" and path == "/answer":
+            data = await _read_json(receive)
+            token, answer = data.get("token", ""), data.get("answer", "")
+            if not isinstance(token, str) or not isinstance(answer, str):
+                raise TokenError("token and answer must be strings")
+            with metrics.span("api_answer"):
+                body = answer_payload(token, answer)
+        elif method == "GET" and path == "/result":
+            with metrics.span("api_result"):
+                body = result_payload(query.get("token", ""), query.get("name", ""), query.get("dob"))
+        elif method == "GET" and path == "/metrics":
+            await _send(send, 200, metrics.exposition().encode(), b"text/plain; version=0.0.4")
+            return
+        elif method == "GET" and path == "/healthz":
+            body = {"ok": True}
+        else:
+            await _send_json(send, 404, {"error": "not found"})
+            return
+    except ValueError as exc:          # TokenError, bad dates
+        await _send_json(send, 400, {"error": str(exc)})
+        return
+    await _send_json(send, 200, body)
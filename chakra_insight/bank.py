@@ -0,0 +1,265 @@
+"""Swappable knowledge banks: a JSON source format and a compiled binary artifact.
+
+A bank source is one JSON object::
+
+    {"format": 1, "name": "default", "language": "en", "logo_url": "...",
+     "chakras":     ["Root (Muladhara)", ...],                  # exactly seven, root → crown
+     "questions":   [{"id": "safety_finance", "text": "..."}, ...],
+     "likelihoods": {"<chakra>": {"<question id>": 0.9, ...}, ...},
+     "remedies":    {"<chakra>": {"why": "...", "do": "...", ...}, ...},
+     "colors":      {"<chakra>": "#E53935", ...},
+     "color_names": {"<chakra>": "Red", ...}}
+
+``validate`` checks it completely, including that every chakra has a likelihood for every
+question id. ``compile_bank`` writes the binary form:
+
+    header (128 bytes)  magic, format, sizes, section offsets, SHA-256 of the header
+                        (digest field zeroed) and everything after it
+    matrix              float64 (chakras × questions), 64-byte aligned
+    question ids        UTF-8, NUL-separated
+    meta                UTF-8 JSON: question texts, remedies, colours, names
+
+``load_compiled`` memory-maps the file, checks the digest and that every section lies
+inside the file where the header says. The likelihood matrix is a read-only view into
+the mapping, with no copy, so worker processes share its pages.
+Set ``$CHAKRA_BANK`` to a compiled bank to use it instead of the built-in one, and
+optionally ``$CHAKRA_BANK_SHA256`` to pin the expected digest.
+"""
+import hashlib
+import json
+import mmap
+import os
+import struct
+import sys
+from typing import Dict, List, Optional
+
+import numpy as np
+
+FORMAT_VERSION = 1                        # source format
+COMPILED_VERSION = 2                      # binary format; 2 = header covered by the digest
+MAGIC = b"CHAKRAKB"
+_HEADER = struct.Struct("<8sIIII4Q32s")   # magic, format, chakras, questions, reserved, 4 offsets/lengths, digest
+_HEADER_SIZE = 128
+_ALIGN = 64
+N_CHAKRAS = 7                             # birth hint and mantras assume the seven, in order
+REMEDY_KEYS = ("why", "do", "crystal", "link", "affirm", "mudra", "oil", "food", "journal", "ritual")
+
+
+class BankError(ValueError):
+    pass
+
+
+# -----------------------------
+# Source format
+# -----------------------------
+def builtin_source() -> Dict:
+    """The built-in knowledge base in source form (``bank export``)."""
+    from . import knowledge
+
+    return {
+        "format": FORMAT_VERSION, "name": "default", "language": "en", "logo_url": knowledge.LOGO_URL,
+        "chakras": list(knowledge.CHAKRAS),
+        "questions": [{"id": q["id"], "text": q["text"]} for q in knowledge.QUESTIONS],
+        "likelihoods": {c: dict(knowledge.LIKELIHOODS[c]) for c in knowledge.CHAKRAS},
+        "remedies": {c: dict(knowledge.REMEDIES[c]) for c in knowledge.CHAKRAS},
+        "colors": dict(knowledge.CHAKRA_COLORS),
+        "color_names": dict(knowledge.CHAKRA_COLOR_NAMES),
+    }
+
+
+def validate(src: Dict) -> None:
+    """Raise BankError listing every problem found in a bank source."""
+    problems: List[str] = []
+    if src.get("format") != FORMAT_VERSION:
+        problems.append(f"format must be {FORMAT_VERSION}")
+    chakras = src.get("chakras")
+    if not isinstance(chakras, list) or len(chakras) != N_CHAKRAS or len(set(chakras)) != N_CHAKRAS:
+        problems.append(f"chakras must be {N_CHAKRAS} distinct names")
+        chakras = []
+    questions = src.get("questions")
+    if not isinstance(questions, list) or not questions:
+        problems.append("questions must be a non-empty list")
+        questions = []
+    ids = [q.get("id") if isinstance(q, dict) else None for q in questions]
+    for i, (q, qid) in enumerate(zip(questions, ids)):
+        if not isinstance(qid, str) or not qid or "\0" in qid:
+            problems.append(f"questions[{i}]: id must be a non-empty string")
+        if not isinstance(q, dict) or not isinstance(q.get("text"), str) or not q["text"].strip():
+            problems.append(f"questions[{i}]: text must be a non-empty string")
+    dupes = sorted({q for q in ids if ids.count(q) > 1 and isinstance(q, str)})
+    if dupes:
+        problems.append(f"duplicate question ids: {', '.join(dupes)}")
+
+    for section in ("likelihoods", "remedies", "colors", "color_names"):
+        table = src.get(section)
+        if not isinstance(table, dict):
+            problems.append(f"{section} must be an object keyed by chakra")
+            continue
+        extra = sorted(set(table) - set(chakras))
+        if extra and chakras:
+            problems.append(f"{section}: unknown chakras {', '.join(extra)}")
+        for c in chakras:
+            if c not in table:
+                problems.append(f"{section}: missing {c}")
+                continue
+            value = table[c]
+            if section == "likelihoods":
+                row = value if isinstance(value, dict) else {}
+                missing = [q for q in ids if q not in row]
+                if missing:
+                    problems.append(f"likelihoods[{c}]: missing {', '.join(map(str, missing))}")
+                unknown = sorted(set(row) - set(ids))
+                if unknown:
+                    problems.append(f"likelihoods[{c}]: unknown question ids {', '.join(unknown)}")
+                bad = [q for q, p in row.items()
+                       if not isinstance(p, (int, float)) or isinstance(p, bool) or not 0.0 <= p <= 1.0]
+                if bad:
+                    problems.append(f"likelihoods[{c}]: values must be in [0, 1] ({', '.join(bad)})")
+            elif section == "remedies":
+                missing = [k for k in REMEDY_KEYS if not isinstance(value, dict) or not isinstance(value.get(k), str)]
+                if missing:
+                    problems.append(f"remedies[{c}]: missing {', '.join(missing)}")
+            elif section == "colors":
+                if not (isinstance(value, str) and len(value) == 7 and value[0] == "#"
+                        and all(ch in "0123456789abcdefABCDEF" for ch in value[1:])):
+                    problems.append(f"colors[{c}]: must be #RRGGBB")
+            elif not isinstance(value, str):
+                problems.append(f"color_names[{c}]: must be a string")
+    if problems:
+        raise BankError("invalid bank:\n  " + "\n  ".join(problems))
+
+
+def read_source(path: str) -> Dict:
+    with open(path, encoding="utf-8") as fh:
+        src = json.load(fh)
+    validate(src)
+    return src
+
+
+# -----------------------------
+# Compiled artifact
+# -----------------------------
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def _digest(header: bytes, body) -> bytes:
+    """SHA-256 of the 128-byte header with its digest field zeroed, then the body."""
+    h = hashlib.sha256(header[:_HEADER.size - 32])
+    h.update(b"\0" * 32)
+    h.update(header[_HEADER.size:_HEADER_SIZE])
+    h.update(body)
+    return h.digest()
+
+
+def compile_bank(src: Dict, path: str) -> str:
+    """Validate ``src`` and write the compiled bank to ``path``; returns its hex digest."""
+    validate(src)
+    chakras = src["chakras"]
+    ids = [q["id"] for q in src["questions"]]
+    matrix = np.array([[src["likelihoods"][c][q] for q in ids] for c in chakras], dtype="<f8")
+    ids_blob = "\0".join(ids).encode()
+    meta = json.dumps({
+        "name": src.get("name", ""), "language": src.get("language", ""), "logo_url": src.get("logo_url"),
+        "chakras": chakras, "texts": [q["text"] for q in src["questions"]],
+        "remedies": src["remedies"], "colors": src["colors"], "color_names": src["color_names"],
+    }, ensure_ascii=False, sort_keys=True).encode()
+
+    body = bytearray(matrix.tobytes())
+    body += b"\0" * _pad(len(body))
+    ids_offset = _HEADER_SIZE + len(body)
+    body += ids_blob + b"\0" * _pad(len(ids_blob))
+    meta_offset = _HEADER_SIZE + len(body)
+    body += meta
+    fields = (MAGIC, COMPILED_VERSION, len(chakras), len(ids), 0, ids_offset, len(ids_blob), meta_offset, len(meta))
+    digest = _digest(_HEADER.pack(*fields, b"\0" * 32).ljust(_HEADER_SIZE, b"\0"), body)
+    header = _HEADER.pack(*fields, digest).ljust(_HEADER_SIZE, b"\0")
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "wb") as fh:
+        fh.write(header)
+        fh.write(body)
+    os.replace(tmp, path)
+    return digest.hex()
+
+
+class CompiledBank:
+    """A loaded bank; ``likelihoods`` is a read-only view into the mapped file."""
+
+    def __init__(self, path: str, digest: str, matrix: np.ndarray, question_ids: List[str], meta: Dict):
+        self.path = path
+        self.digest = digest
+        self.likelihoods = matrix
+        self.question_ids = question_ids
+        self.question_index = {q: i for i, q in enumerate(question_ids)}
+        self.name = meta["name"]
+        self.language = meta["language"]
+        self.logo_url = meta["logo_url"]
+        self.chakras = meta["chakras"]
+        self.questions = [{"id": q, "text": t} for q, t in zip(question_ids, meta["texts"])]
+        self.remedies = meta["remedies"]
+        self.colors = meta["colors"]
+        self.color_names = meta["color_names"]
+
+
+def load_compiled(path: str, expected_sha256: Optional[str] = None) -> CompiledBank:
+    """Map a compiled bank, verifying its digest (and ``expected_sha256`` when given)."""
+    with open(path, "rb") as fh:
+        mm = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(mm) < _HEADER_SIZE:
+        raise BankError(f"{path}: not a compiled bank")
+    magic, fmt, n_chakras, n_questions, _, ids_offset, ids_len, meta_offset, meta_len, digest = \
+        _HEADER.unpack_from(mm)
+    if magic != MAGIC or fmt != COMPILED_VERSION:
+        raise BankError(f"{path}: not a compiled bank (or an unsupported format; recompile it)")
+    view = memoryview(mm)
+    try:
+        if _digest(bytes(view[:_HEADER_SIZE]), view[_HEADER_SIZE:]) != digest:
+            raise BankError(f"{path}: checksum mismatch, the file is corrupt or truncated")
+        if expected_sha256 and digest.hex() != expected_sha256.lower():
+            raise BankError(f"{path}: digest {digest.hex()} does not match the pinned {expected_sha256}")
+        if not (n_chakras == N_CHAKRAS and n_questions > 0
+                and _HEADER_SIZE + n_chakras * n_questions * 8 <= ids_offset
+                and ids_offset + ids_len <= meta_offset and meta_offset + meta_len <= len(mm)):
+            raise BankError(f"{path}: header sizes and offsets are inconsistent")
+        ids = [sys.intern(q) for q in bytes(view[ids_offset:ids_offset + ids_len]).decode().split("\0")]
+        meta = json.loads(bytes(view[meta_offset:meta_offset + meta_len]))
+        if len(ids) != n_questions or len(meta["texts"]) != n_questions or len(meta["chakras"]) != n_chakras:
+            raise BankError(f"{path}: section sizes do not match the header")
+    finally:
+        view.release()
+    matrix = np.frombuffer(mm, dtype="<f8", count=n_chakras * n_questions,
+                           offset=_HEADER_SIZE).reshape(n_chakras, n_questions)
+    return CompiledBank(path, digest.hex(), matrix, ids, meta)
+
+
+def likelihood_dicts(bank: CompiledBank) -> Dict[str, Dict[str, float]]:
+    """``LIKELIHOODS``-style nested dicts for code that wants them (a small copy)."""
+    rows = bank.likelihoods.tolist()
+    return {c: dict(zip(bank.question_ids, row)) for c, row in zip(bank.chakras, rows)}
+
+
+def main(argv=None) -> int:
+    import argparse
+
+    ap = argparse.ArgumentParser(prog="chakra_insight bank", description="Validate, compile or export knowledge banks.")
+    sub = ap.add_subparsers(dest="action", required=True)
+    va = sub.add_parser("validate", help="check a bank source (JSON)")
+    va.add_argument("source")
+    co = sub.add_parser("compile", help="compile a bank source to the binary form")
+    co.add_argument("source")
+    co.add_argument("-o", "--output", required=True)
+    ex = sub.add_parser("export", help="write the built-in bank as a source file")
+    ex.add_argument("output")
+    args = ap.parse_args(argv)
+
+    if args.action == "validate":
+        src = read_source(args.source)
+        print(f"{args.source}: ok ({len(src['questions'])} questions, {len(src['chakras'])} chakras)")
+    elif args.action == "compile":
+        digest = compile_bank(read_source(args.source), args.output)
+        print(f"wrote {args.output} ({os.path.getsize(args.output):,} bytes), sha256 {digest}")
+    else:
+        with open(args.output, "w", encoding="utf-8") as fh:
+            json.dump(builtin_source(), fh, ensure_ascii=False, indent=1)
+        print(f"wrote {args.output}")
+    return 0
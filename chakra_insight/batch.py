@@ -0,0 +1,167 @@
+"""Bulk scoring of completed questionnaires from CSV/JSONL exports.
+
+Input rows carry one column per question id holding "Yes" / "No" / "Not sure" (blank or
+missing = not asked), plus optional ``id``, ``name`` and ``dob`` columns. JSONL rows may
+instead nest the answers under an ``answers`` object. Rows are read in chunks, encoded
+to int8 answer codes and scored with one matrix product per chunk; results stream to
+CSV or Parquet so memory stays bounded by the chunk size. The output columns and their
+types are fixed up front (``OUTPUT_COLUMNS``), whatever each chunk happens to contain.
+
+pandas is imported here only, and pyarrow only for Parquet output.
+"""
+import sys
+import time
+from typing import Iterable, Iterator, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import engine
+from .engine import ANSWER_CODES, ANSWERS, STOP_THRESHOLD, UNSURE
+from .knowledge import CHAKRAS
+
+DEFAULT_CHUNKSIZE = 100_000
+PASSTHROUGH = ("id", "name")
+OUTPUT_COLUMNS = (PASSTHROUGH + ("winner", "confidence", "reached_threshold", "questions_answered", "birth_chakra")
+                  + tuple(f"p_{c}" for c in CHAKRAS))
+
+
+def read_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator["pd.DataFrame"]:
+    import pandas as pd
+
+    if path.endswith((".jsonl", ".ndjson", ".json")):
+        reader = pd.read_json(path, lines=True, chunksize=chunksize, dtype=False)
+    else:
+        reader = pd.read_csv(path, chunksize=chunksize, dtype=str, keep_default_na=False)
+    with reader:
+        for chunk in reader:
+            if "answers" in chunk.columns:
+                nested = pd.DataFrame.from_records(
+                    [a if isinstance(a, dict) else {} for a in chunk["answers"]], index=chunk.index)
+                chunk = pd.concat([chunk.drop(columns="answers"), nested], axis=1)
+            yield chunk
+
+
+def encode_answers(frame) -> np.ndarray:
+    """(rows, questions) int8 codes: 0 = Yes, 1 = No, 2 = Not sure / not asked."""
+    import pandas as pd
+
+    codes = np.full((len(frame), len(engine.QUESTION_IDS)), UNSURE, dtype=np.int8)
+    for j, qid in enumerate(engine.QUESTION_IDS):
+        if qid in frame.columns:
+            col = pd.Categorical(frame[qid], categories=ANSWERS).codes
+            codes[:, j] = np.where(col < 0, UNSURE, col)
+    return codes
+
+
+def encode_pairs(records: Sequence[Iterable[Tuple[str, str]]], fill: int = UNSURE) -> np.ndarray:
+    """(rows, questions) int8 codes from (question id, answer) pair lists; ``fill`` = not asked."""
+    codes = np.full((len(records), len(engine.QUESTION_IDS)), fill, dtype=np.int8)
+    for i, answers in enumerate(records):
+        for qid, answer in answers:
+            j = engine.QUESTION_INDEX.get(qid)
+            if j is not None:
+                codes[i, j] = ANSWER_CODES.get(answer, UNSURE)
+    return codes
+
+
+def _answered(frame) -> np.ndarray:
+    cols = [q for q in engine.QUESTION_IDS if q in frame.columns]
+    if not cols:
+        return np.zeros(len(frame), dtype=np.int16)
+    return frame[cols].isin(ANSWERS).sum(axis=1).to_numpy(dtype=np.int16)
+
+
+def birth_chakras(dob_column):
+    """Vectorised ``chakra_from_birth`` over a column of ISO dates (None where missing)."""
+    import pandas as pd
+
+    dates = pd.to_datetime(dob_column, errors="coerce")
+    idx = (dates.dt.day + dates.dt.month + 6) % 7          # == ((day + month) % 7 or 7) - 1
+    names = np.array(CHAKRAS, dtype=object)
+    out = np.full(len(dates), None, dtype=object)
+    ok = idx.notna().to_numpy()
+    out[ok] = names[idx[ok].astype(int).to_numpy()]
+    return out
+
+
+def _strings(frame, column: str) -> np.ndarray:
+    """``frame[column]`` as str objects (None where missing or absent)."""
+    out = np.full(len(frame), None, dtype=object)
+    if column in frame.columns:
+        values = frame[column]
+        ok = values.notna().to_numpy()
+        out[ok] = values[ok].astype(str).to_numpy()
+    return out
+
+
+def score_frame(frame):
+    """Score one chunk; returns a DataFrame of results with ``OUTPUT_COLUMNS``."""
+    import pandas as pd
+
+    post = engine.batch_posteriors(encode_answers(frame))
+    best = post.argmax(axis=1)
+    conf = post[np.arange(len(post)), best]
+    out = pd.DataFrame({c: _strings(frame, c) for c in PASSTHROUGH})
+    out["winner"] = np.array(CHAKRAS, dtype=object)[best]
+    out["confidence"] = conf
+    out["reached_threshold"] = conf >= STOP_THRESHOLD
+    out["questions_answered"] = _answered(frame)
+    out["birth_chakra"] = (birth_chakras(frame["dob"]) if "dob" in frame.columns
+                           else np.full(len(frame), None, dtype=object))
+    for j, c in enumerate(CHAKRAS):
+        out[f"p_{c}"] = post[:, j]
+    return out
+
+
+class _ParquetSink:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError as exc:  # optional dependency
+            raise RuntimeError("Parquet output needs pyarrow (pip install pyarrow)") from exc
+        self._pa, self._pq, self._path, self._writer = pa, pq, path, None
+        types = {"confidence": pa.float64(), "reached_threshold": pa.bool_(), "questions_answered": pa.int16()}
+        self._schema = pa.schema([(c, types.get(c, pa.float64() if c.startswith("p_") else pa.string()))
+                                  for c in OUTPUT_COLUMNS])
+
+    def write(self, df) -> None:
+        table = self._pa.Table.from_pandas(df[list(OUTPUT_COLUMNS)], schema=self._schema, preserve_index=False)
+        if self._writer is None:
+            self._writer = self._pq.ParquetWriter(self._path, self._schema)
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+
+class _CsvSink:
+    def __init__(self, path: str):
+        self._fh = sys.stdout if path == "-" else open(path, "w", encoding="utf-8", newline="")
+        self._header = True
+
+    def write(self, df) -> None:
+        df[list(OUTPUT_COLUMNS)].to_csv(self._fh, header=self._header, index=False, float_format="%.6g")
+        self._header = False
+
+    def close(self) -> None:
+        if self._fh is not sys.stdout:
+            self._fh.close()
+
+
+def score_file(src: str, dest: str, chunksize: int = DEFAULT_CHUNKSIZE,
+               fmt: Optional[str] = None, progress=None) -> int:
+    """Score every row of ``src`` into ``dest`` (CSV or Parquet). Returns the row count."""
+    fmt = fmt or ("parquet" if dest.endswith((".parquet", ".pq")) else "csv")
+    sink = _ParquetSink(dest) if fmt == "parquet" else _CsvSink(dest)
+    rows, t0 = 0, time.perf_counter()
+    try:
+        for chunk in read_chunks(src, chunksize):
+            sink.write(score_frame(chunk))
+            rows += len(chunk)
+            if progress:
+                progress(rows, time.perf_counter() - t0)
+    finally:
+        sink.close()
+    return rows
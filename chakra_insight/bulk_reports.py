@@ -0,0 +1,124 @@
+"""Parallel bulk rendering of "Chakra Insight Report" PDFs.
+
+Sessions (name, email, DOB, answers) are read lazily from JSON/JSONL or a wide CSV and
+fanned out over a process pool. At most a few tasks per worker are in flight, and each
+finished PDF goes straight to disk — a directory of files, or one ``.zip`` — so memory
+stays flat however many reports are produced. Workers never touch the network: they
+use the logo file given on the command line, or an already cached copy, or none.
+A record that fails to render (say, an unparseable DOB) is logged with its id and
+counted in the stats; the rest of the cohort is still rendered.
+"""
+import csv
+import os
+import re
+import sys
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, Iterator, Optional, Tuple
+
+from .engine import QUESTION_IDS
+
+
+def iter_sessions(path: str) -> Iterator[Dict]:
+    """Records with ``answers`` as (question id, answer) pairs, from JSON/JSONL or CSV."""
+    if path.endswith(".csv"):
+        with open(path, newline="", encoding="utf-8") as fh:
+            for row in csv.DictReader(fh):
+                row["answers"] = [(q, row[q]) for q in QUESTION_IDS if row.get(q)]
+                yield row
+        return
+    from .cli import read_records
+
+    for rec in read_records(path):
+        answers = rec.get("answers", {})
+        rec["answers"] = list(answers.items()) if isinstance(answers, dict) else [tuple(a) for a in answers]
+        yield rec
+
+
+def report_filename(index: int, rec: Dict) -> str:
+    stem = str(index if rec.get("id") in (None, "") else rec["id"])
+    name = re.sub(r"[^A-Za-z0-9]+", "_", rec.get("name") or "").strip("_")
+    return f"{stem}_{name}.pdf" if name else f"{stem}.pdf"
+
+
+def _init_worker(logo: Optional[str]) -> None:
+    os.environ["CHAKRA_OFFLINE"] = "1"
+    if logo:
+        os.environ["CHAKRA_LOGO"] = logo
+
+
+def _render(index: int, rec: Dict, out_dir: Optional[str]) -> Tuple[str, int, Optional[bytes]]:
+    from .insight import score_session
+    from .report import render_report
+
+    posterior = score_session(rec["answers"])["posterior"]
+    pdf = render_report(posterior, rec.get("name") or "", rec.get("email") or "", rec.get("dob"))
+    filename = report_filename(index, rec)
+    if out_dir is None:
+        return filename, len(pdf), pdf
+    with open(os.path.join(out_dir, filename), "wb") as fh:
+        fh.write(pdf)
+    return filename, len(pdf), None
+
+
+def render_all(src: str, dest: str, logo: Optional[str] = None, workers: Optional[int] = None,
+               progress=None) -> Dict[str, float]:
+    """Render every session in ``src`` into ``dest`` (a directory, or a path ending in .zip)."""
+    workers = workers or os.cpu_count() or 1
+    to_zip = dest.endswith(".zip")
+    if to_zip:
+        archive = zipfile.ZipFile(dest, "w", compression=zipfile.ZIP_STORED)   # PDFs are compressed
+        out_dir = None
+    else:
+        os.makedirs(dest, exist_ok=True)
+        archive, out_dir = None, dest
+    max_in_flight = workers * 4
+    done = failed = total_bytes = 0
+    labels = {}                                   # future -> record id (or line number)
+    t0 = time.perf_counter()
+
+    def collect(finished) -> None:
+        nonlocal done, failed, total_bytes
+        for fut in finished:
+            label = labels.pop(fut)
+            try:
+                filename, size, pdf = fut.result()
+            except Exception as exc:
+                failed += 1
+                print(f"\nreports: record {label}: {type(exc).__name__}: {exc}", file=sys.stderr)
+                continue
+            if archive is not None:
+                archive.writestr(filename, pdf)
+            done += 1
+            total_bytes += size
+            if progress:
+                progress(done, time.perf_counter() - t0)
+
+    try:
+        with ProcessPoolExecutor(workers, initializer=_init_worker, initargs=(logo,)) as pool:
+            pending = set()
+            for i, rec in enumerate(iter_sessions(src), 1):
+                fut = pool.submit(_render, i, rec, out_dir)
+                labels[fut] = i if rec.get("id") in (None, "") else rec["id"]
+                pending.add(fut)
+                if len(pending) >= max_in_flight:
+                    finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    collect(finished)
+            collect(wait(pending)[0])
+    finally:
+        if archive is not None:
+            archive.close()
+    seconds = time.perf_counter() - t0
+    return {
+        "reports": done,
+        "failed": failed,
+        "seconds": seconds,
+        "reports_per_sec": done / seconds if seconds else 0.0,
+        "mb_per_sec": total_bytes / 1e6 / seconds if seconds else 0.0,
+        "workers": workers,
+    }
+
+
+def print_progress(done: int, seconds: float) -> None:
+    print(f"\r{done:,} reports  {done / max(seconds, 1e-9):,.1f} reports/s", end="", file=sys.stderr)
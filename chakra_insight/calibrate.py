@@ -0,0 +1,279 @@
+"""Calibration of the likelihood table from logged answer sets.
+
+Each logged session is modelled as a draw from a mixture over chakras: the chakra is
+latent, and every Yes / No answer is a Bernoulli draw with that chakra's yes-probability
+for the question ("Not sure" and unasked questions carry no evidence, as in the
+engine). EM runs on sufficient statistics only — expected yes counts, expected answer
+counts and expected chakra weights — so each pass streams the logs in fixed-size
+chunks, with two matrix products per chunk. The first pass keeps the parsed answer
+codes in a temporary int8 file; later passes read that file back through a memmap.
+
+The hand-set ``LIKELIHOODS`` are both the starting point and a Beta prior of adjustable
+strength. That keeps each mixture component tied to the chakra it started as, and keeps
+rarely answered questions near their hand-set values.
+
+The output is a JSON likelihood file with a version number. It also stores the
+sufficient statistics, so ``refit`` can fold in new logs without rereading old ones.
+The app loads the file from ``$CHAKRA_LIKELIHOODS`` and reloads it when it changes.
+"""
+import datetime
+import hashlib
+import json
+import os
+import tempfile
+import time
+from typing import Callable, Dict, Iterator, Optional, Sequence
+
+import numpy as np
+
+from . import engine
+from .engine import NO, YES
+from .knowledge import CHAKRAS, LIKELIHOOD_MATRIX, LIKELIHOODS
+
+FORMAT_VERSION = 1
+DEFAULT_CHUNKSIZE = 100_000
+DEFAULT_STRENGTH = 20.0      # pseudo-answers per (chakra, question) behind the hand-set values
+_EPS = 1e-3                  # keep every probability strictly inside (0, 1)
+
+
+def bank_id() -> str:
+    """Identifies the chakras and question ids a likelihood file was fitted for."""
+    h = hashlib.sha256("\n".join(CHAKRAS).encode() + b"\0" + "\n".join(engine.QUESTION_IDS).encode())
+    return h.hexdigest()[:16]
+
+
+def handset_matrix() -> np.ndarray:
+    """The bank's own likelihoods; a compiled bank's read-only mapped matrix when in use."""
+    if LIKELIHOOD_MATRIX is not None:
+        return LIKELIHOOD_MATRIX
+    return np.array([[LIKELIHOODS[c][q] for q in engine.QUESTION_IDS] for c in CHAKRAS], dtype=np.float64)
+
+
+class Stats:
+    """EM sufficient statistics: expected yes / answered counts per (chakra, question)."""
+
+    def __init__(self, yes: Optional[np.ndarray] = None, answered: Optional[np.ndarray] = None,
+                 weight: Optional[np.ndarray] = None, rows: int = 0):
+        shape = (len(CHAKRAS), len(engine.QUESTION_IDS))
+        self.yes = np.zeros(shape) if yes is None else np.asarray(yes, dtype=np.float64)
+        self.answered = np.zeros(shape) if answered is None else np.asarray(answered, dtype=np.float64)
+        self.weight = np.zeros(shape[0]) if weight is None else np.asarray(weight, dtype=np.float64)
+        self.rows = int(rows)
+
+    def __add__(self, other: "Stats") -> "Stats":
+        return Stats(self.yes + other.yes, self.answered + other.answered,
+                     self.weight + other.weight, self.rows + other.rows)
+
+    def scaled(self, factor: float) -> "Stats":
+        return Stats(self.yes * factor, self.answered * factor, self.weight * factor, self.rows)
+
+
+class Calibration:
+    """A fitted likelihood matrix plus what is needed to refit it incrementally."""
+
+    def __init__(self, like: np.ndarray, prior: np.ndarray, stats: Stats, version: int = 1,
+                 log_likelihood: float = float("nan"), iterations: int = 0, created_at: str = ""):
+        self.like = like
+        self.prior = prior
+        self.stats = stats
+        self.version = version
+        self.log_likelihood = log_likelihood
+        self.iterations = iterations
+        self.created_at = created_at
+
+    def to_json(self) -> Dict:
+        return {
+            "format": FORMAT_VERSION,
+            "version": self.version,
+            "bank": bank_id(),
+            "created_at": self.created_at,
+            "rows": self.stats.rows,
+            "iterations": self.iterations,
+            "log_likelihood_per_row": self.log_likelihood,
+            "prior": {c: float(p) for c, p in zip(CHAKRAS, self.prior)},
+            "likelihoods": {c: {q: round(float(p), 6) for q, p in zip(engine.QUESTION_IDS, row)}
+                            for c, row in zip(CHAKRAS, self.like)},
+            "stats": {"yes": self.stats.yes.tolist(), "answered": self.stats.answered.tolist(),
+                      "weight": self.stats.weight.tolist()},
+        }
+
+    @classmethod
+    def from_json(cls, data: Dict) -> "Calibration":
+        if data.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported likelihood file format {data.get('format')!r}")
+        if data.get("bank") != bank_id():
+            raise ValueError("likelihood file was fitted for a different question bank")
+        like = np.array([[data["likelihoods"][c][q] for q in engine.QUESTION_IDS] for c in CHAKRAS])
+        prior = np.array([data["prior"][c] for c in CHAKRAS])
+        st = data["stats"]
+        return cls(like, prior, Stats(st["yes"], st["answered"], st["weight"], data["rows"]),
+                   data["version"], data["log_likelihood_per_row"], data["iterations"], data["created_at"])
+
+    def save(self, path: str) -> None:
+        """Write atomically, so a reloading app never reads a half-written file."""
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump(self.to_json(), fh, indent=1)
+        os.replace(tmp, path)
+
+
+def load(path: str) -> Calibration:
+    with open(path, encoding="utf-8") as fh:
+        return Calibration.from_json(json.load(fh))
+
+
+def apply(path: str) -> Calibration:
+    """Load a likelihood file and make it the engine's likelihood matrix."""
+    cal = load(path)
+    engine.set_likelihoods(cal.like)
+    return cal
+
+
+# -----------------------------
+# Log sources
+# -----------------------------
+def iter_code_chunks(path: str, chunksize: int = DEFAULT_CHUNKSIZE) -> Iterator[np.ndarray]:
+    """(rows, questions) int8 answer codes from a CSV/JSONL export or a session database."""
+    if path.endswith((".db", ".sqlite", ".sqlite3")):
+        from .batch import encode_pairs
+        from .store import read_sessions
+
+        last = 0
+        while True:
+            batch = list(read_sessions(path, after_id=last, limit=chunksize))
+            if not batch:
+                return
+            last = batch[-1]["id"]
+            yield encode_pairs([rec["answers"] for rec in batch])
+        return
+    from .batch import encode_answers, read_chunks
+
+    for frame in read_chunks(path, chunksize):
+        yield encode_answers(frame)
+
+
+# -----------------------------
+# EM
+# -----------------------------
+def _accumulate(codes: np.ndarray, like: np.ndarray, log_prior: np.ndarray):
+    """E-step over one chunk: its sufficient statistics and summed log-likelihood."""
+    yes = (codes == YES).astype(np.float64)
+    answered = yes + (codes == NO)
+    log_yes = np.log(like)
+    log_no = np.log1p(-like)
+    logits = yes @ log_yes.T + (answered - yes) @ log_no.T + log_prior      # (rows, chakras)
+    m = logits.max(axis=1, keepdims=True)
+    w = np.exp(logits - m)
+    total = w.sum(axis=1, keepdims=True)
+    resp = w / total
+    stats = Stats(resp.T @ yes, resp.T @ answered, resp.sum(axis=0), len(codes))
+    return stats, float((np.log(total) + m).sum())
+
+
+def _m_step(stats: Stats, anchor: np.ndarray, strength: float):
+    like = (stats.yes + strength * anchor) / (stats.answered + strength)
+    prior = (stats.weight + 1.0) / (stats.weight.sum() + len(stats.weight))
+    return np.clip(like, _EPS, 1 - _EPS), prior
+
+
+class _CodeCache:
+    """First pass parses the sources into a temporary int8 file; later passes memmap it."""
+
+    def __init__(self, sources: Sequence[str], chunksize: int):
+        self.sources = sources
+        self.chunksize = chunksize
+        self.rows = 0
+        self._file = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._file is not None:
+            self._file.close()
+
+    def chunks(self) -> Iterator[np.ndarray]:
+        width = len(engine.QUESTION_IDS)
+        if self._file is None:
+            self._file = tempfile.TemporaryFile(prefix="chakra_codes_")
+            for path in self.sources:
+                for codes in iter_code_chunks(path, self.chunksize):
+                    self._file.write(np.ascontiguousarray(codes, dtype=np.int8).tobytes())
+                    self.rows += len(codes)
+                    yield codes
+            self._file.flush()
+            return
+        if not self.rows:
+            return
+        data = np.memmap(self._file, dtype=np.int8, mode="r", shape=(self.rows, width))
+        for start in range(0, self.rows, self.chunksize):
+            yield np.asarray(data[start:start + self.chunksize])
+
+
+def refit(sources: Sequence[str], previous: Optional[Calibration] = None, iterations: int = 50,
+          tol: float = 1e-6, strength: float = DEFAULT_STRENGTH, decay: float = 1.0,
+          chunksize: int = DEFAULT_CHUNKSIZE,
+          progress: Optional[Callable[[int, float, int], None]] = None) -> Calibration:
+    """Fit likelihoods to the logs in ``sources``, on top of ``previous`` if given.
+
+    Without ``previous`` this is plain EM from the hand-set values. With it, only the new
+    logs are read: the stored statistics of the earlier logs (scaled by ``decay``, < 1 to
+    favour recent behaviour) are held fixed and EM runs over the new rows alone.
+    Iteration stops once the per-row log-likelihood improves by less than ``tol``.
+    """
+    anchor = handset_matrix()
+    base = previous.stats.scaled(decay) if previous is not None else Stats()
+    like = previous.like if previous is not None else anchor
+    prior = previous.prior if previous is not None else np.full(len(CHAKRAS), 1.0 / len(CHAKRAS))
+    last_ll, ll, done = -np.inf, float("nan"), 0
+    with _CodeCache(list(sources), chunksize) as cache:
+        for it in range(1, iterations + 1):
+            new, total_ll = Stats(), 0.0
+            log_prior = np.log(prior)
+            for codes in cache.chunks():
+                chunk_stats, chunk_ll = _accumulate(codes, like, log_prior)
+                new, total_ll = new + chunk_stats, total_ll + chunk_ll
+            if not new.rows:
+                raise ValueError("no sessions found in the given logs")
+            like, prior = _m_step(base + new, anchor, strength)
+            ll, done = total_ll / new.rows, it
+            if progress:
+                progress(it, ll, new.rows)
+            if ll - last_ll < tol:
+                break
+            last_ll = ll
+    version = previous.version + 1 if previous is not None else 1
+    created = datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds")
+    return Calibration(like, prior, base + new, version, ll, done, created)
+
+
+def main(argv=None) -> int:
+    import argparse
+    import sys
+
+    ap = argparse.ArgumentParser(prog="chakra_insight calibrate",
+                                 description="Fit the likelihood table to logged sessions (EM).")
+    ap.add_argument("logs", nargs="+", help="CSV/JSONL exports or chakra_sessions.db files")
+    ap.add_argument("-o", "--output", required=True, help="likelihood file to write (JSON)")
+    ap.add_argument("--update", metavar="FILE",
+                    help="previous likelihood file: fold the new logs into it instead of refitting all")
+    ap.add_argument("--iterations", type=int, default=50)
+    ap.add_argument("--strength", type=float, default=DEFAULT_STRENGTH,
+                    help=f"weight of the hand-set values, in answers (default: {DEFAULT_STRENGTH:g})")
+    ap.add_argument("--decay", type=float, default=1.0, help="weight of earlier logs with --update")
+    ap.add_argument("--chunksize", type=int, default=DEFAULT_CHUNKSIZE)
+    args = ap.parse_args(argv)
+
+    previous = load(args.update) if args.update else None
+    t0 = time.perf_counter()
+
+    def progress(it, ll, rows):
+        print(f"iteration {it}: {rows:,} rows, log-likelihood/row {ll:.5f} "
+              f"({time.perf_counter() - t0:.1f}s)", file=sys.stderr)
+
+    cal = refit(args.logs, previous, args.iterations, strength=args.strength, decay=args.decay,
+                chunksize=args.chunksize, progress=progress)
+    cal.save(args.output)
+    print(f"wrote {args.output}: version {cal.version}, {cal.stats.rows:,} rows in total, "
+          f"max change vs hand-set {np.abs(cal.like - handset_matrix()).max():.3f}", file=sys.stderr)
+    return 0
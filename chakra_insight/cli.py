@@ -0,0 +1,194 @@
+"""Command-line entry point: ``python -m chakra_insight <command> ...``."""
+import argparse
+import json
+import os
+import sys
+from typing import Dict, Iterator, List
+
+
+def read_records(path: str) -> Iterator[Dict]:
+    """Yield answer-set records from a .json (object or list) or .jsonl file ('-' = stdin)."""
+    fh = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    with fh:
+        if path.endswith(".json"):
+            data = json.load(fh)
+            yield from (data if isinstance(data, list) else [data])
+            return
+        for line in fh:
+            if line.strip():
+                yield json.loads(line)
+
+
+def _answer_pairs(answers) -> List:
+    # {"qid": "Yes", ...} in the order asked, or [["qid", "Yes"], ...]
+    return list(answers.items()) if isinstance(answers, dict) else [tuple(a) for a in answers]
+
+
+def cmd_score(args) -> int:
+    from .insight import score_session
+
+    out = open(args.output, "w", encoding="utf-8") if args.output else sys.stdout
+    try:
+        for path in args.files:
+            for rec in read_records(path):
+                result = score_session(_answer_pairs(rec.get("answers", {})), rec.get("name", ""), rec.get("dob"))
+                if "id" in rec:
+                    result = {"id": rec["id"], **result}
+                out.write(json.dumps(result, ensure_ascii=False) + "\n")
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+def cmd_batch(args) -> int:
+    from .batch import score_file
+
+    def progress(rows, seconds):
+        print(f"\r{rows:,} rows  {rows / max(seconds, 1e-9):,.0f} rows/s", end="", file=sys.stderr)
+
+    rows = score_file(args.input, args.output, args.chunksize, args.format,
+                      None if args.quiet else progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    return 0 if rows else 1
+
+
+def cmd_reports(args) -> int:
+    from .bulk_reports import print_progress, render_all
+
+    if args.logo and not os.path.exists(args.logo):
+        raise RuntimeError(f"logo not found: {args.logo}")
+    stats = render_all(args.input, args.output, args.logo, args.workers,
+                       None if args.quiet else print_progress)
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"{stats['reports']:,} reports in {stats['seconds']:.1f}s on {stats['workers']} workers: "
+          f"{stats['reports_per_sec']:,.1f} reports/s, {stats['mb_per_sec']:.2f} MB/s", file=sys.stderr)
+    if stats["failed"]:
+        print(f"{stats['failed']:,} records failed to render", file=sys.stderr)
+    return 1 if stats["failed"] else 0
+
+
+def cmd_simulate(args) -> int:
+    from .simulate import format_report, simulate
+
+    result = simulate(args.sessions, args.unsure_rate, args.seed, args.workers, args.selector)
+    print(format_report(result))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(result, fh, indent=2)
+    return 0
+
+
+def cmd_policy(args) -> int:
+    from .policy import main as policy_main
+
+    policy_main(args.rest)
+    return 0
+
+
+def cmd_calibrate(args) -> int:
+    from .calibrate import main as calibrate_main
+
+    try:
+        return calibrate_main(args.rest)
+    except ValueError as exc:
+        raise RuntimeError(str(exc)) from exc
+
+
+def cmd_bank(args) -> int:
+    from .bank import main as bank_main
+
+    try:
+        return bank_main(args.rest)
+    except (OSError, ValueError) as exc:
+        raise RuntimeError(str(exc)) from exc
+
+
+def cmd_optimize(args) -> int:
+    from .optimize import Evaluator, discrimination, eliminate, format_report
+
+    def progress(step):
+        print(f"dropped {step['removed']}: {step['size']} questions, accuracy {step['accuracy']:.1%}, "
+              f"{step['avg_questions']:.2f} asked ({step['evaluated']} subsets, {step['seconds']:.1f}s)",
+              file=sys.stderr)
+
+    with Evaluator(args.sessions, args.unsure_rate, args.seed, args.workers, cache_path=args.cache) as ev:
+        result = eliminate(ev, args.max_loss, args.min_size, progress)
+    questions = discrimination()
+    print(format_report(result, questions))
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(dict(result, questions=questions), fh, indent=2)
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="chakra_insight", description="Headless Chakra Insight tools.")
+    sub = ap.add_subparsers(dest="command", required=True)
+
+    sc = sub.add_parser("score", help="score answer sets from JSON/JSONL files, one JSON result per line")
+    sc.add_argument("files", nargs="+", help="input files ('-' for stdin)")
+    sc.add_argument("-o", "--output", help="write results here instead of stdout")
+    sc.set_defaults(func=cmd_score)
+
+    ba = sub.add_parser("batch", help="bulk-score a CSV/JSONL export into CSV or Parquet")
+    ba.add_argument("input", help="CSV or JSONL with one column per question id")
+    ba.add_argument("-o", "--output", required=True, help="output .csv or .parquet ('-' for CSV on stdout)")
+    ba.add_argument("--format", choices=("csv", "parquet"), help="default: from the output suffix")
+    ba.add_argument("--chunksize", type=int, default=100_000, help="rows per chunk (default: 100000)")
+    ba.add_argument("-q", "--quiet", action="store_true")
+    ba.set_defaults(func=cmd_batch)
+
+    re_ = sub.add_parser("reports", help="render PDF reports for many sessions in parallel")
+    re_.add_argument("input", help="JSON/JSONL records or a wide CSV (name, email, dob, answers)")
+    re_.add_argument("-o", "--output", required=True, help="output directory, or a .zip file")
+    re_.add_argument("--logo", help="local logo image (default: cached copy, never downloaded)")
+    re_.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    re_.add_argument("-q", "--quiet", action="store_true")
+    re_.set_defaults(func=cmd_reports)
+
+    si = sub.add_parser("simulate", help="Monte Carlo accuracy / efficiency benchmark")
+    si.add_argument("--sessions", type=int, default=10_000, help="sessions per chakra (default: 10000)")
+    si.add_argument("--unsure-rate", type=float, default=0.05, help="probability of 'Not sure' (default: 0.05)")
+    si.add_argument("--seed", type=int, default=0)
+    si.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    si.add_argument("--selector", choices=("greedy", "policy"), default="greedy",
+                    help="live greedy selection, or the compiled policy")
+    si.add_argument("--json", help="also write the full result as JSON")
+    si.set_defaults(func=cmd_simulate)
+
+    po = sub.add_parser("compile-policy", help="compile the question policy (see chakra_insight.policy)")
+    po.add_argument("rest", nargs=argparse.REMAINDER)
+    po.set_defaults(func=cmd_policy)
+
+    ca = sub.add_parser("calibrate", help="fit the likelihood table to logged sessions (see chakra_insight.calibrate)")
+    ca.add_argument("rest", nargs=argparse.REMAINDER)
+    ca.set_defaults(func=cmd_calibrate)
+
+    bk = sub.add_parser("bank", help="validate / compile / export knowledge banks (see chakra_insight.bank)")
+    bk.add_argument("rest", nargs=argparse.REMAINDER)
+    bk.set_defaults(func=cmd_bank)
+
+    op = sub.add_parser("optimize", help="search for a smaller question subset by simulation")
+    op.add_argument("--sessions", type=int, default=2_000, help="sessions per chakra per subset (default: 2000)")
+    op.add_argument("--unsure-rate", type=float, default=0.05, help="probability of 'Not sure' (default: 0.05)")
+    op.add_argument("--seed", type=int, default=0)
+    op.add_argument("--workers", type=int, help="processes (default: CPU count)")
+    op.add_argument("--max-loss", type=float, default=0.02,
+                    help="accuracy the subset may lose against the full bank (default: 0.02)")
+    op.add_argument("--min-size", type=int, default=1, help="never go below this many questions")
+    op.add_argument("--cache", help="JSON file of evaluated subsets, reused by later runs")
+    op.add_argument("--json", help="also write the full result as JSON")
+    op.set_defaults(func=cmd_optimize)
+    return ap
+
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    try:
+        return args.func(args)
+    except RuntimeError as exc:
+        print(f"error: {exc}", file=sys.stderr)
+        return 2
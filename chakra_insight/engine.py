@@ -0,0 +1,214 @@
+"""Bayesian 20Q inference engine.
+
+``LIKELIHOODS`` is turned into a (chakras × questions) matrix once at import, so
+scoring every candidate question is a single batched NumPy operation in log-space.
+The dict-based helpers keep the signatures the app has always used.
+"""
+import math
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .knowledge import CHAKRAS, LIKELIHOOD_MATRIX, LIKELIHOODS, QUESTIONS
+
+# -----------------------------
+# Answers
+# -----------------------------
+ANSWERS = ("Yes", "No", "Not sure")
+ANSWER_CODES = {a: i for i, a in enumerate(ANSWERS)}
+YES, NO, UNSURE = range(3)
+
+# Weight the original scorer gave to a "Not sure" answer. Such an answer leaves the
+# posterior untouched, so it never contributes information gain.
+UNSURE_WEIGHT = 0.05
+
+# Stop asking once the leading chakra reaches this posterior probability.
+STOP_THRESHOLD = 0.88
+
+# -----------------------------
+# Likelihood matrix
+# -----------------------------
+QUESTION_IDS: List[str] = [q["id"] for q in QUESTIONS]
+QUESTION_INDEX: Dict[str, int] = {qid: i for i, qid in enumerate(QUESTION_IDS)}
+
+# Finite stand-ins for log(0) so indicator-matrix products never see 0 * -inf.
+_LOG_FLOOR = -700.0
+
+
+def _tables(like: np.ndarray):
+    with np.errstate(divide="ignore"):
+        log_yes, log_no = np.log(like), np.log1p(-like)
+    return like, log_yes, log_no, np.maximum(log_yes, _LOG_FLOOR), np.maximum(log_no, _LOG_FLOOR)
+
+
+# A compiled bank's matrix is used in place (a read-only view into the mapped file).
+# _TABLES is replaced in one assignment; code that needs more than one table takes them
+# all from it, so a concurrent set_likelihoods never mixes two matrices.
+_TABLES = _tables(
+    LIKELIHOOD_MATRIX if LIKELIHOOD_MATRIX is not None else
+    np.array([[LIKELIHOODS[c][qid] for qid in QUESTION_IDS] for c in CHAKRAS], dtype=np.float64))
+LIKE, LOG_YES, LOG_NO, LOG_YES_FINITE, LOG_NO_FINITE = _TABLES
+
+
+def set_likelihoods(like: np.ndarray) -> None:
+    """Swap in a new (chakras × questions) likelihood matrix, e.g. a calibrated one.
+
+    Everything here reads the tables at call time, so later calls use the new values.
+    Compiled policies are tied to the old matrix through ``policy.fingerprint``.
+    A read-only float64 matrix (a compiled bank's mapped view) is used as is; anything
+    else is copied, so the caller cannot change it afterwards.
+    """
+    global _TABLES, LIKE, LOG_YES, LOG_NO, LOG_YES_FINITE, LOG_NO_FINITE
+    like = np.asarray(like, dtype=np.float64)
+    if like.flags.writeable:
+        like = like.copy()
+    if like.shape != (len(CHAKRAS), len(QUESTION_IDS)):
+        raise ValueError(f"likelihood matrix must be {len(CHAKRAS)}×{len(QUESTION_IDS)}, got {like.shape}")
+    if not ((like >= 0) & (like <= 1)).all():
+        raise ValueError("likelihoods must lie in [0, 1]")
+    _TABLES = tables = _tables(like)
+    LIKE, LOG_YES, LOG_NO, LOG_YES_FINITE, LOG_NO_FINITE = tables
+
+_LN2 = math.log(2.0)
+TIE_TOLERANCE = 1e-12
+
+
+def uniform_vector() -> np.ndarray:
+    return np.full(len(CHAKRAS), 1.0 / len(CHAKRAS))
+
+
+def to_vector(probs: Dict[str, float]) -> np.ndarray:
+    return np.array([probs[c] for c in CHAKRAS], dtype=np.float64)
+
+
+def to_dict(vec: np.ndarray) -> Dict[str, float]:
+    return {c: float(p) for c, p in zip(CHAKRAS, vec)}
+
+
+def _softmax(logp: np.ndarray, axis: int = 0) -> np.ndarray:
+    m = np.max(logp, axis=axis, keepdims=True)
+    m = np.where(np.isfinite(m), m, 0.0)
+    w = np.exp(logp - m)
+    total = w.sum(axis=axis, keepdims=True)
+    # All-zero columns fall back to uniform, like ``normalize``.
+    return np.divide(w, total, out=np.full_like(w, 1.0 / w.shape[axis]), where=total > 0)
+
+
+def entropy_vector(p: np.ndarray, axis: int = 0) -> np.ndarray:
+    with np.errstate(divide="ignore", invalid="ignore"):
+        terms = np.where(p > 0, p * np.log2(p), 0.0)
+    return -terms.sum(axis=axis)
+
+
+def information_gains(p: np.ndarray, candidates: Optional[Iterable[int]] = None) -> np.ndarray:
+    """Expected information gain (bits) of each candidate question, in one batched pass.
+
+    ``p`` is a posterior vector over ``CHAKRAS`` — or an (N, chakras) stack of them;
+    ``candidates`` are question indices (all questions when omitted). Returns one gain
+    per candidate, with the same leading shape as ``p``.
+    """
+    cols = slice(None) if candidates is None else np.asarray(list(candidates), dtype=np.intp)
+    _, log_yes, log_no, _, _ = _TABLES
+    with np.errstate(divide="ignore"):
+        logp = np.log(p)[..., :, None]
+    base_h = entropy_vector(p, axis=-1)[..., None]
+    gains = 0.0
+    for log_like in (log_yes[:, cols], log_no[:, cols]):
+        joint = logp + log_like                      # log P(c, a | q), shape (..., C, K)
+        m = np.max(joint, axis=-2)
+        m = np.where(np.isfinite(m), m, 0.0)
+        pa = np.exp(joint - m[..., None, :]).sum(axis=-2)   # P(a | q) / exp(m)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            log_pa = np.log(pa) + m
+            log_post = joint - log_pa[..., None, :]
+            post = np.exp(log_post)
+            h = -np.where(post > 0, post * log_post, 0.0).sum(axis=-2) / _LN2
+        pa = np.exp(log_pa)
+        gains = gains + np.where(pa > 0, pa * (base_h - h), 0.0)
+    return np.asarray(gains, dtype=np.float64)
+
+
+def best_question(p: np.ndarray, asked: Iterable[int]) -> Optional[int]:
+    """Index of the unasked question with the highest expected gain, or None."""
+    mask = np.ones(len(QUESTION_IDS), dtype=bool)
+    mask[list(asked)] = False
+    candidates = np.flatnonzero(mask)
+    if candidates.size == 0:
+        return None
+    gains = information_gains(p, candidates)
+    # First candidate within rounding of the best, so exact ties resolve in bank order.
+    return int(candidates[np.argmax(gains >= gains.max() - TIE_TOLERANCE)])
+
+
+def update_vector(p: np.ndarray, qidx: int, code: int) -> np.ndarray:
+    """Posterior after answering question ``qidx`` with answer ``code``."""
+    if code == YES:
+        log_like = LOG_YES[:, qidx]
+    elif code == NO:
+        log_like = LOG_NO[:, qidx]
+    else:
+        log_like = 0.0                               # "Not sure" is uninformative
+    with np.errstate(divide="ignore"):
+        return _softmax(np.log(p) + log_like)
+
+
+def batch_best_questions(P: np.ndarray, asked: np.ndarray) -> np.ndarray:
+    """``best_question`` for N sessions at once.
+
+    ``P`` is (N, chakras), ``asked`` an (N, questions) boolean mask. Returns question
+    indices, -1 for sessions with nothing left to ask.
+    """
+    gains = np.where(asked, -np.inf, information_gains(P))
+    best = gains.max(axis=1, keepdims=True)
+    picks = np.argmax(gains >= best - TIE_TOLERANCE, axis=1)
+    return np.where(np.isfinite(best[:, 0]), picks, -1)
+
+
+def batch_update(P: np.ndarray, qidx: np.ndarray, codes: np.ndarray) -> np.ndarray:
+    """``update_vector`` for N sessions, each answering its own question."""
+    col = codes[:, None]
+    _, log_yes, log_no, _, _ = _TABLES
+    log_like = np.where(col == YES, log_yes[:, qidx].T, np.where(col == NO, log_no[:, qidx].T, 0.0))
+    with np.errstate(divide="ignore"):
+        return _softmax(np.log(P) + log_like, axis=1)
+
+
+def batch_posteriors(codes: np.ndarray) -> np.ndarray:
+    """Posteriors for many completed answer sets at once.
+
+    ``codes`` is an (N, questions) array of answer codes; anything other than
+    ``YES``/``NO`` (``UNSURE``, or unanswered) is uninformative. Returns (N, chakras),
+    starting from a uniform prior.
+    """
+    yes = (codes == YES).astype(np.float64)
+    no = (codes == NO).astype(np.float64)
+    _, _, _, log_yes, log_no = _TABLES
+    return _softmax(yes @ log_yes.T + no @ log_no.T, axis=1)
+
+
+# -----------------------------
+# Dict-based API used by the app
+# -----------------------------
+def normalize(probs: Dict[str, float]) -> Dict[str, float]:
+    total = sum(probs.values())
+    if total == 0:
+        return {k: 1.0/len(probs) for k in probs}
+    return {k: v/total for k, v in probs.items()}
+
+
+def entropy(probs: Dict[str, float]) -> float:
+    return -sum(p * math.log2(p) for p in probs.values() if p > 0)
+
+
+def expected_information_gain(current: Dict[str, float], qid: str) -> float:
+    return float(information_gains(to_vector(current), [QUESTION_INDEX[qid]])[0])
+
+
+def choose_next_question(asked_ids: set, posterior: Dict[str, float]) -> Optional[Dict]:
+    idx = best_question(to_vector(posterior), (QUESTION_INDEX[q] for q in asked_ids))
+    return None if idx is None else QUESTIONS[idx]
+
+
+def update_posterior(posterior: Dict[str, float], qid: str, answer: str) -> Dict[str, float]:
+    code = ANSWER_CODES.get(answer, UNSURE)
+    return to_dict(update_vector(to_vector(posterior), QUESTION_INDEX[qid], code))
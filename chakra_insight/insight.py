@@ -0,0 +1,67 @@
+"""Birth-date hint, session scoring and the narrative summary — no UI dependencies."""
+import datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .engine import STOP_THRESHOLD, normalize, update_posterior
+from .knowledge import CHAKRAS, CHAKRA_COLOR_NAMES, REMEDIES
+
+
+def chakra_from_birth(dob: datetime.date | None) -> str | None:
+    if not dob:
+        return None
+    idx = ((dob.day + dob.month) % 7) or 7
+    return CHAKRAS[idx - 1]
+
+
+def make_summary(name: str, birth_chakra: str | None, winner: str, ordered: List):
+    # ordered = list of (chakra, prob) sorted desc
+    top2 = ordered[1][0] if len(ordered) > 1 else None
+    lines = []
+    who = name or "Dear Soul"
+    if birth_chakra:
+        lines.append(f"{who}, your birth energy gently leans toward **{birth_chakra}**.")
+    lines.append(
+        f"Today’s answers highlight **{winner}** as the primary chakra to balance, "
+        f"with {top2} offering a supportive theme." if top2 else
+        f"Today’s answers highlight **{winner}** as the primary chakra to balance."
+    )
+    lines.append(
+        f"Your power color for the day is **{CHAKRA_COLOR_NAMES[winner]}** — keep it close (clothes, journal, or a tiny swatch)."
+    )
+    lines.append(
+        f"Crystal allies: **{REMEDIES[winner]['crystal']}**. Affirm: _{REMEDIES[winner]['affirm']}_"
+    )
+    lines.append(
+        "Tiny plan: 7 minutes of practice → 3 minutes breath, 2 minutes movement, 2 minutes journaling."
+    )
+    return " ".join(lines)
+
+
+def parse_dob(value) -> Optional[datetime.date]:
+    if not value:
+        return None
+    if isinstance(value, datetime.date):
+        return value
+    return datetime.date.fromisoformat(str(value)[:10])
+
+
+def score_session(answers: Iterable[Tuple[str, str]], name: str = "", dob=None) -> Dict:
+    """Replay (question id, answer) pairs and describe the result the app would show."""
+    posterior = normalize({c: 1.0 for c in CHAKRAS})
+    n_asked = 0
+    for qid, answer in answers:
+        posterior = update_posterior(posterior, qid, answer)
+        n_asked += 1
+    ordered = sorted(posterior.items(), key=lambda kv: kv[1], reverse=True)
+    winner, conf = ordered[0]
+    birth_chakra = chakra_from_birth(parse_dob(dob))
+    return {
+        "name": name,
+        "winner": winner,
+        "confidence": conf,
+        "reached_threshold": conf >= STOP_THRESHOLD,
+        "questions_answered": n_asked,
+        "birth_chakra": birth_chakra,
+        "posterior": posterior,
+        "summary": make_summary(name or "Dear Soul", birth_chakra, winner, ordered),
+    }
@@ -0,0 +1,215 @@
+"""Knowledge base: questions, chakras, likelihoods and remedies.
+
+The literals below are the built-in bank. ``$CHAKRA_BANK`` swaps in a compiled bank
+(see ``chakra_insight.bank``) at import time.
+"""
+import os
+from typing import Dict, List
+
+# -----------------------------
+# Branding
+# -----------------------------
+LOGO_URL = "https://ik.imagekit.io/86edsgbur/Untitled%20design%20(73)%20(3)%20(1).jpg?updatedAt=1759258123716"
+
+CHAKRA_COLORS = {
+    "Root (Muladhara)": "#E53935",
+    "Sacral (Svadhisthana)": "#FB8C00",
+    "Solar Plexus (Manipura)": "#FBC02D",
+    "Heart (Anahata)": "#43A047",
+    "Throat (Vishuddha)": "#1E88E5",
+    "Third Eye (Ajna)": "#5E35B1",
+    "Crown (Sahasrara)": "#8E24AA",
+}
+CHAKRA_COLOR_NAMES = {
+    "Root (Muladhara)": "Red",
+    "Sacral (Svadhisthana)": "Orange",
+    "Solar Plexus (Manipura)": "Yellow",
+    "Heart (Anahata)": "Green",
+    "Throat (Vishuddha)": "Blue",
+    "Third Eye (Ajna)": "Indigo",
+    "Crown (Sahasrara)": "Violet",
+}
+
+# -----------------------------
+# Knowledge Base
+# -----------------------------
+QUESTIONS: List[Dict] = [
+    {"id": "safety_finance", "text": "Do you often worry about safety, stability, or finances?"},
+    {"id": "body_pain_legs", "text": "Do you feel heaviness/pain in legs, knees, or lower back?"},
+    {"id": "guilt_shame", "text": "Do you feel guilt or shame around pleasure or expression?"},
+    {"id": "creativity_flow", "text": "Is your creativity/libido low or inconsistent?"},
+    {"id": "control_perfection", "text": "Do you feel a strong need to control or perfectionism?"},
+    {"id": "digestive_issue", "text": "Do you face frequent digestive/acidity issues?"},
+    {"id": "heart_walls", "text": "Do you keep emotional walls or find it hard to forgive?"},
+    {"id": "grief_breathe", "text": "Do you carry grief or experience shallow breathing?"},
+    {"id": "people_pleasing", "text": "Do you fear judgment or struggle to speak needs clearly?"},
+    {"id": "throat_tension", "text": "Do you feel throat tension or frequent sore throat?"},
+    {"id": "self_doubt", "text": "Do you feel self-doubt or overthinking blocks your intuition?"},
+    {"id": "sleep_dreams", "text": "Are sleep/dreams restless or hard to remember?"},
+    {"id": "disconnected_spirit", "text": "Do you feel disconnected from purpose/Divine guidance?"},
+    {"id": "head_pressure", "text": "Do you feel heavy head/crown pressure during stress?"},
+]
+
+CHAKRAS = [
+    "Root (Muladhara)",
+    "Sacral (Svadhisthana)",
+    "Solar Plexus (Manipura)",
+    "Heart (Anahata)",
+    "Throat (Vishuddha)",
+    "Third Eye (Ajna)",
+    "Crown (Sahasrara)",
+]
+
+LIKELIHOODS: Dict[str, Dict[str, float]] = {
+    "Root (Muladhara)": {
+        "safety_finance": 0.9, "body_pain_legs": 0.8, "guilt_shame": 0.2, "creativity_flow": 0.3,
+        "control_perfection": 0.4, "digestive_issue": 0.3, "heart_walls": 0.3, "grief_breathe": 0.2,
+        "people_pleasing": 0.4, "throat_tension": 0.3, "self_doubt": 0.5, "sleep_dreams": 0.4,
+        "disconnected_spirit": 0.4, "head_pressure": 0.3,
+    },
+    "Sacral (Svadhisthana)": {
+        "safety_finance": 0.4, "body_pain_legs": 0.3, "guilt_shame": 0.8, "creativity_flow": 0.8,
+        "control_perfection": 0.3, "digestive_issue": 0.4, "heart_walls": 0.4, "grief_breathe": 0.3,
+        "people_pleasing": 0.5, "throat_tension": 0.3, "self_doubt": 0.5, "sleep_dreams": 0.5,
+        "disconnected_spirit": 0.4, "head_pressure": 0.3,
+    },
+    "Solar Plexus (Manipura)": {
+        "safety_finance": 0.5, "body_pain_legs": 0.3, "guilt_shame": 0.4, "creativity_flow": 0.4,
+        "control_perfection": 0.85, "digestive_issue": 0.8, "heart_walls": 0.5, "grief_breathe": 0.4,
+        "people_pleasing": 0.7, "throat_tension": 0.4, "self_doubt": 0.6, "sleep_dreams": 0.5,
+        "disconnected_spirit": 0.4, "head_pressure": 0.4,
+    },
+    "Heart (Anahata)": {
+        "safety_finance": 0.4, "body_pain_legs": 0.3, "guilt_shame": 0.5, "creativity_flow": 0.5,
+        "control_perfection": 0.4, "digestive_issue": 0.4, "heart_walls": 0.85, "grief_breathe": 0.8,
+        "people_pleasing": 0.7, "throat_tension": 0.4, "self_doubt": 0.6, "sleep_dreams": 0.5,
+        "disconnected_spirit": 0.5, "head_pressure": 0.4,
+    },
+    "Throat (Vishuddha)": {
+        "safety_finance": 0.4, "body_pain_legs": 0.3, "guilt_shame": 0.6, "creativity_flow": 0.5,
+        "control_perfection": 0.5, "digestive_issue": 0.3, "heart_walls": 0.5, "grief_breathe": 0.5,
+        "people_pleasing": 0.85, "throat_tension": 0.85, "self_doubt": 0.6, "sleep_dreams": 0.5,
+        "disconnected_spirit": 0.5, "head_pressure": 0.4,
+    },
+    "Third Eye (Ajna)": {
+        "safety_finance": 0.4, "body_pain_legs": 0.3, "guilt_shame": 0.5, "creativity_flow": 0.6,
+        "control_perfection": 0.5, "digestive_issue": 0.3, "heart_walls": 0.4, "grief_breathe": 0.4,
+        "people_pleasing": 0.5, "throat_tension": 0.4, "self_doubt": 0.85, "sleep_dreams": 0.7,
+        "disconnected_spirit": 0.7, "head_pressure": 0.5,
+    },
+    "Crown (Sahasrara)": {
+        "safety_finance": 0.4, "body_pain_legs": 0.3, "guilt_shame": 0.5, "creativity_flow": 0.5,
+        "control_perfection": 0.4, "digestive_issue": 0.3, "heart_walls": 0.4, "grief_breathe": 0.4,
+        "people_pleasing": 0.4, "throat_tension": 0.3, "self_doubt": 0.6, "sleep_dreams": 0.6,
+        "disconnected_spirit": 0.85, "head_pressure": 0.7,
+    },
+}
+
+REMEDIES: Dict[str, Dict[str, str]] = {
+    "Root (Muladhara)": {
+        "why": "Safety, survival, and belonging themes dominate. Body seeks ground and routine.",
+        "do": "Grounding walk barefoot, money-clarity ritual, red foods, LAM x108, EFT on fear.",
+        "crystal": "Red Jasper / Hematite",
+        "affirm": "I am safe. I am supported. I belong.",
+        "ritual": "Morning: 5-min box-breath (4-4-4-4), 10-min barefoot walk; Night: 3 safety wins + Ho’oponopono for 'money/safety'.",
+        "journal": "What makes my body feel safe? One tiny action I can take today.",
+        "food": "Root vegetables, proteins, warm soups.",
+        "oil": "Vetiver / Patchouli",
+        "mudra": "Prithvi Mudra (ring finger + thumb)",
+        "link": "https://myaurabliss.com/product/sulemani-hakik-stone-bracelet-stone-bracelet-for-men-and-women/",
+    },
+    "Sacral (Svadhisthana)": {
+        "why": "Guilt/shame around pleasure/expressiveness blocks flow.",
+        "do": "Hip-opening yoga, joyful movement/dance, orange foods, VAM x108, forgiveness/Ho’oponopono.",
+        "crystal": "Carnelian / Moonstone",
+        "affirm": "I allow myself to feel and create.",
+        "ritual": "5 minutes pelvis circles + 60s laughter practice; create something small (voice note, doodle).",
+        "journal": "Where do I withhold joy? What would playful look like today?",
+        "food": "Orange fruits, healthy fats.",
+        "oil": "Orange / Ylang-Ylang",
+        "mudra": "Varun Mudra (little finger + thumb)",
+        "link": "https://myaurabliss.com/product/reiki-crystal-carnelian-bracelet-reiki-healing-crystal-stone/",
+    },
+    "Solar Plexus (Manipura)": {
+        "why": "Control and self-judgment exhaust personal power.",
+        "do": "Breath of fire, core strengthening, yellow foods, RAM x108, release perfection journaling.",
+        "crystal": "Citrine / Tiger’s Eye",
+        "affirm": "My power is kind and steady.",
+        "ritual": "Morning: 3×(30s) Breath of Fire → 1-min plank; Midday: finish ONE priority; Night: note 3 ways you used kind power; burn one perfection thought.",
+        "journal": "If I wasn’t trying to be perfect, I would… What tiny brave act can I do in 2 minutes?",
+        "food": "Ginger tea, turmeric, yellow dals/grains.",
+        "oil": "Lemon / Rosemary",
+        "mudra": "Rudra Mudra (index + ring + thumb)",
+        "link": "https://myaurabliss.com/product/natural-citrine-bracelet/",
+    },
+    "Heart (Anahata)": {
+        "why": "Unprocessed grief and guardedness limit love circulation.",
+        "do": "Heart-coherent breathing, green foods, YAM x108, loving-kindness practice, forgiveness letters.",
+        "crystal": "Rose Quartz / Green Aventurine",
+        "affirm": "My heart is open and safe.",
+        "ritual": "Inhale 5s / exhale 5s at heart; send kindness to self→one person; self-hug 60s.",
+        "journal": "Where am I holding a wall? What boundary would keep love flowing?",
+        "food": "Leafy greens, mindful cacao.",
+        "oil": "Rose / Geranium",
+        "mudra": "Hridaya Mudra",
+        "link": "https://myaurabliss.com/product/natural-green-aventurine-unisex-stone-bracelet/",
+    },
+    "Throat (Vishuddha)": {
+        "why": "People-pleasing and fear of judgment compress expression.",
+        "do": "Humming/chanting, boundary scripts, journaling truths, HAM x108, sky-gazing.",
+        "crystal": "Blue Lace Agate / Aquamarine / Turquoise",
+        "affirm": "I speak my truth with love.",
+        "ritual": "1 min humming; speak one clear request today; write 3 lines: 'What I really want to say is…'",
+        "journal": "Where did I betray my voice? What is one loving 'no'?",
+        "food": "Warm water with honey/ginger.",
+        "oil": "Peppermint / Eucalyptus",
+        "mudra": "Granthi Mudra",
+        "link": "https://myaurabliss.com/product/turquoise-firoza-beads-bracelet/",
+    },
+    "Third Eye (Ajna)": {
+        "why": "Overthinking clouds intuition and imagery.",
+        "do": "Trataka (candle-gazing), screen detox, AM x108, dream journal, intuition walks.",
+        "crystal": "Amethyst / Lapis Lazuli",
+        "affirm": "I trust my inner guidance.",
+        "ritual": "2 minutes candle-gaze; ask one question before walk; note the first symbol/color you notice.",
+        "journal": "What did my body whisper today?",
+        "food": "Blueberries, purple foods.",
+        "oil": "Frankincense / Clary Sage",
+        "mudra": "Kalesvara Mudra",
+        "link": "https://myaurabliss.com/product/unlocking-the-power-of-lapis-lazuli-experience-benefits-of-wearing-a-lapis-bracelet/",
+    },
+    "Crown (Sahasrara)": {
+        "why": "Spiritual disconnection and meaning-drift.",
+        "do": "Morning silence, gratitude, OM x108, service act, white/light foods, nature time.",
+        "crystal": "Clear Quartz / Selenite",
+        "affirm": "I am one with Divine light.",
+        "ritual": "3 minutes stillness on waking; list 5 gratitudes; one tiny act of service.",
+        "journal": "Where did grace touch my day?",
+        "food": "Coconut water, sattvic simplicity.",
+        "oil": "Lavender / Sandalwood",
+        "mudra": "Sahasrara Mudra (open palms up)",
+        "link": "https://myaurabliss.com/product/selenite-bracelet/",
+    },
+}
+
+# -----------------------------
+# Swappable bank
+# -----------------------------
+# (chakras × questions) read-only view into a compiled bank; None for the built-in one.
+LIKELIHOOD_MATRIX = None
+BANK_DIGEST = None
+
+if os.environ.get("CHAKRA_BANK"):
+    from .bank import likelihood_dicts, load_compiled
+
+    _bank = load_compiled(os.environ["CHAKRA_BANK"], os.environ.get("CHAKRA_BANK_SHA256"))
+    LOGO_URL = _bank.logo_url or LOGO_URL
+    CHAKRA_COLORS = _bank.colors
+    CHAKRA_COLOR_NAMES = _bank.color_names
+    QUESTIONS = _bank.questions
+    CHAKRAS = _bank.chakras
+    LIKELIHOODS = likelihood_dicts(_bank)
+    REMEDIES = _bank.remedies
+    LIKELIHOOD_MATRIX = _bank.likelihoods
+    BANK_DIGEST = _bank.digest
+    del _bank
@@ -0,0 +1,259 @@
+"""Timing spans, in-process histograms and an optional slow-rerun sampling profiler.
+
+Everything is off unless configured through the environment:
+
+    CHAKRA_METRICS=1               record spans into histograms
+    CHAKRA_METRICS_FILE=path       also rewrite ``path`` with the Prometheus text format
+    CHAKRA_METRICS_INTERVAL=15     ... every this many seconds (and at exit)
+    CHAKRA_PROFILE_SLOW_MS=250     sample the stack during reruns; keep reruns slower than this
+    CHAKRA_PROFILE_DIR=dir         where slow-rerun stacks go (default: <tmp>/chakra_profiles)
+
+When disabled, ``span`` returns one shared no-op context manager and ``timed`` returns
+the function unchanged, so instrumented code pays a function call at most.
+Histograms use fixed buckets and are exposed with ``exposition()`` (served at ``/metrics``
+by the API). Profiles are written in collapsed-stack format, one ``frame;frame;... count``
+line per stack, which flamegraph.pl and speedscope read directly.
+"""
+import atexit
+import bisect
+import contextlib
+import functools
+import os
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional
+
+ENABLED = bool(os.environ.get("CHAKRA_METRICS"))
+METRICS_FILE = os.environ.get("CHAKRA_METRICS_FILE")
+METRICS_INTERVAL = float(os.environ.get("CHAKRA_METRICS_INTERVAL", "15"))
+PROFILE_SLOW_MS = float(os.environ.get("CHAKRA_PROFILE_SLOW_MS", "0"))
+PROFILE_DIR = os.environ.get("CHAKRA_PROFILE_DIR") or os.path.join(tempfile.gettempdir(), "chakra_profiles")
+PROFILE_INTERVAL = 0.005
+
+BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Fixed-bucket latency histogram (seconds)."""
+
+    __slots__ = ("counts", "sum", "count", "_lock")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS) + 1)
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, seconds: float) -> None:
+        i = bisect.bisect_left(BUCKETS, seconds)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += seconds
+            self.count += 1
+
+
+_histograms: Dict[str, Histogram] = {}
+_registry_lock = threading.Lock()
+_NOOP = contextlib.nullcontext()
+
+
+def histogram(name: str) -> Histogram:
+    h = _histograms.get(name)
+    if h is None:
+        with _registry_lock:
+            h = _histograms.setdefault(name, Histogram())
+    return h
+
+
+def observe(name: str, seconds: float) -> None:
+    if ENABLED:
+        histogram(name).observe(seconds)
+
+
+class _Span:
+    __slots__ = ("hist", "t0")
+
+    def __init__(self, hist: Histogram):
+        self.hist = hist
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.hist.observe(time.perf_counter() - self.t0)
+        return False
+
+
+def span(name: str):
+    """``with span("update_posterior"): ...`` — times the block when metrics are on."""
+    return _Span(histogram(name)) if ENABLED else _NOOP
+
+
+def timed(name: str) -> Callable:
+    """Decorator form of ``span``; a no-op (the function itself) when metrics are off."""
+    def wrap(fn):
+        if not ENABLED:
+            return fn
+        hist = histogram(name)
+
+        @functools.wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                hist.observe(time.perf_counter() - t0)
+        return inner
+    return wrap
+
+
+def exposition() -> str:
+    """All histograms in the Prometheus text exposition format."""
+    lines = ["# HELP chakra_span_seconds Time spent in instrumented code paths.",
+             "# TYPE chakra_span_seconds histogram"]
+    for name in sorted(_histograms):
+        h = _histograms[name]
+        with h._lock:
+            counts, total, n = list(h.counts), h.sum, h.count
+        label = name.replace("\\", "\\\\").replace('"', '\\"')
+        running = 0
+        for bound, c in zip(BUCKETS + (float("inf"),), counts):
+            running += c
+            le = "+Inf" if bound == float("inf") else repr(bound)
+            lines.append(f'chakra_span_seconds_bucket{{span="{label}",le="{le}"}} {running}')
+        lines.append(f'chakra_span_seconds_sum{{span="{label}"}} {total:.6f}')
+        lines.append(f'chakra_span_seconds_count{{span="{label}"}} {n}')
+    return "\n".join(lines) + "\n"
+
+
+def dump(path: Optional[str] = None) -> None:
+    """Atomically rewrite ``path`` (default ``$CHAKRA_METRICS_FILE``) with ``exposition()``."""
+    path = path or METRICS_FILE
+    if not path:
+        return
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as fh:
+        fh.write(exposition())
+    os.replace(tmp, path)
+
+
+def _dump_loop() -> None:
+    while True:
+        time.sleep(METRICS_INTERVAL)
+        try:
+            dump()
+        except OSError as exc:
+            print(f"chakra_insight.metrics: cannot write {METRICS_FILE}: {exc}", file=sys.stderr)
+
+
+if ENABLED and METRICS_FILE:
+    threading.Thread(target=_dump_loop, name="chakra-metrics-dump", daemon=True).start()
+    atexit.register(dump)
+
+
+# -----------------------------
+# Reruns and the sampling profiler
+# -----------------------------
+class _Sampler:
+    """One daemon thread sampling the stacks of threads that are inside a rerun."""
+
+    def __init__(self, interval: float):
+        self.interval = interval
+        self.active: Dict[int, List[Counter]] = {}     # thread -> nested runs
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self, ident: int, top: bool) -> Counter:
+        stacks: Counter = Counter()
+        with self._lock:
+            if top:                        # drop runs that never finished (st.rerun() raised)
+                self.active[ident] = []
+            self.active.setdefault(ident, []).append(stacks)
+            self._wake.set()
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="chakra-profiler", daemon=True)
+                self._thread.start()
+        return stacks
+
+    def stop(self, ident: int, stacks: Counter) -> None:
+        with self._lock:
+            runs = [r for r in self.active.get(ident, ()) if r is not stacks]
+            if runs:
+                self.active[ident] = runs
+            else:
+                self.active.pop(ident, None)
+
+    def _run(self) -> None:
+        while True:
+            with self._lock:
+                idle = not self.active
+                if idle:
+                    self._wake.clear()
+            if idle:
+                self._wake.wait()          # sleep until the next rerun starts
+                continue
+            time.sleep(self.interval)
+            with self._lock:
+                frames = sys._current_frames()
+                for ident in [i for i in self.active if i not in frames]:
+                    del self.active[ident]          # thread ended without finishing its run
+                for ident, runs in self.active.items():
+                    stack = _collapse(frames[ident])
+                    for stacks in runs:
+                        stacks[stack] += 1
+
+
+def _collapse(frame) -> str:
+    names: List[str] = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+_sampler = _Sampler(PROFILE_INTERVAL) if PROFILE_SLOW_MS > 0 else None
+
+
+class Rerun:
+    """Times one script or fragment run into the ``name`` histogram.
+
+    With the profiler on, the running thread's stack is sampled until ``finish``. If the
+    run took at least ``$CHAKRA_PROFILE_SLOW_MS``, the samples are written to
+    ``$CHAKRA_PROFILE_DIR``. Runs may nest (a fragment inside a full script run); a
+    ``top`` run discards whatever its thread left unfinished.
+    """
+
+    __slots__ = ("name", "t0", "ident", "stacks")
+
+    def __init__(self, name: str = "rerun", top: bool = False):
+        self.name = name
+        self.ident = threading.get_ident()
+        self.stacks = _sampler.start(self.ident, top) if _sampler is not None else None
+        self.t0 = time.perf_counter()
+
+    def finish(self) -> float:
+        seconds = time.perf_counter() - self.t0
+        observe(self.name, seconds)
+        if self.stacks is not None:
+            _sampler.stop(self.ident, self.stacks)
+            if seconds * 1000 >= PROFILE_SLOW_MS and self.stacks:
+                _write_profile(self.name, seconds, self.stacks)
+        return seconds
+
+
+def _write_profile(name: str, seconds: float, stacks: Counter) -> None:
+    try:
+        os.makedirs(PROFILE_DIR, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(PROFILE_DIR, f"{name}-{stamp}-{os.getpid()}-{int(seconds * 1000)}ms.folded")
+        with open(path, "w", encoding="utf-8") as fh:
+            for stack, count in stacks.most_common():
+                fh.write(f"{stack} {count}\n")
+    except OSError as exc:
+        print(f"chakra_insight.metrics: cannot write profile: {exc}", file=sys.stderr)
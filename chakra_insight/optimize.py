@@ -0,0 +1,228 @@
+"""Offline question-subset optimizer.
+
+A candidate subset of the bank is scored by simulation (``simulate._run_shard`` with
+the greedy selector restricted to the subset): accuracy, average questions asked, and
+the share of sessions that reach ``STOP_THRESHOLD``. Every subset is simulated with the
+same seed, so all candidates face the same synthetic respondents (common random
+numbers), and their differences are not sampling noise between runs.
+
+The search is greedy backward elimination. Starting from the full bank, every
+single-question removal of the current subset is scored in parallel over a process
+pool. The removal that keeps accuracy highest (then fewest questions) is applied, and
+the search repeats until the best removal would lose more than ``max_loss`` accuracy
+against the full bank. Evaluated subsets are cached in memory, and optionally in a
+JSON file that later runs with the same bank and settings reuse.
+
+``discrimination`` reports, per question, how much it separates the chakras on its own:
+the information gain at the uniform prior, the spread of its likelihood column, how
+many chakras share its most common value (``body_pain_legs`` is 0.3 for six), and the
+question whose likelihood column it most resembles.
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import engine
+from .calibrate import bank_id
+from .engine import STOP_THRESHOLD
+from .knowledge import CHAKRAS
+from .simulate import _run_shard, shards
+
+Subset = Tuple[int, ...]
+
+
+# -----------------------------
+# Per-question report
+# -----------------------------
+def discrimination() -> List[Dict]:
+    """Per-question discriminative power and redundancy, from the likelihood table alone."""
+    like = engine.LIKE
+    gains = engine.information_gains(engine.uniform_vector())
+    centered = like - like.mean(axis=0)
+    norms = np.sqrt((centered ** 2).sum(axis=0))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        corr = (centered.T @ centered) / np.outer(norms, norms)
+    corr = np.nan_to_num(corr, nan=0.0)
+    np.fill_diagonal(corr, -np.inf)
+    rows = []
+    for j, qid in enumerate(engine.QUESTION_IDS):
+        values, counts = np.unique(like[:, j], return_counts=True)
+        k = int(np.argmax(corr[j]))
+        rows.append({
+            "id": qid,
+            "gain_bits": float(gains[j]),
+            "spread": float(like[:, j].max() - like[:, j].min()),
+            "top_chakra": CHAKRAS[int(np.argmax(like[:, j]))],
+            "shared_value": float(values[np.argmax(counts)]),
+            "shared_by": int(counts.max()),
+            "most_similar": engine.QUESTION_IDS[k] if len(engine.QUESTION_IDS) > 1 else None,
+            "similarity": float(corr[j, k]) if len(engine.QUESTION_IDS) > 1 else 0.0,
+        })
+    return rows
+
+
+# -----------------------------
+# Subset evaluation
+# -----------------------------
+class SubsetCache:
+    """Evaluated subsets, keyed by their sorted question indices.
+
+    With a ``path``, entries are loaded from and saved to a JSON file. The file is only
+    reused when the bank, likelihoods and simulation settings match.
+    """
+
+    def __init__(self, settings: Dict, path: Optional[str] = None):
+        like = hashlib.sha256(np.ascontiguousarray(engine.LIKE, dtype="<f8").tobytes()).hexdigest()[:16]
+        self.key = dict(settings, bank=bank_id(), likelihoods=like)
+        self.path = path
+        self.entries: Dict[Subset, Dict] = {}
+        if path and os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as fh:
+                    data = json.load(fh)
+                if data.get("key") == self.key:
+                    self.entries = {tuple(int(i) for i in k.split(",") if i): v
+                                    for k, v in data["subsets"].items()}
+            except (OSError, ValueError, KeyError):
+                pass
+
+    def __contains__(self, subset: Subset) -> bool:
+        return subset in self.entries
+
+    def __getitem__(self, subset: Subset) -> Dict:
+        return self.entries[subset]
+
+    def __setitem__(self, subset: Subset, result: Dict) -> None:
+        self.entries[subset] = result
+
+    def save(self) -> None:
+        if not self.path:
+            return
+        tmp = f"{self.path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as fh:
+            json.dump({"key": self.key,
+                       "subsets": {",".join(map(str, k)): v for k, v in self.entries.items()}}, fh)
+        os.replace(tmp, self.path)
+
+
+class Evaluator:
+    """Scores subsets by simulation across a process pool, through a ``SubsetCache``."""
+
+    def __init__(self, sessions_per_chakra: int = 2_000, unsure_rate: float = 0.05, seed: int = 0,
+                 workers: Optional[int] = None, stop_threshold: float = STOP_THRESHOLD,
+                 cache_path: Optional[str] = None):
+        self.settings = {"sessions": sessions_per_chakra, "unsure_rate": unsure_rate, "seed": seed,
+                         "stop_threshold": stop_threshold}
+        self.shards = list(shards(sessions_per_chakra, seed))
+        self.cache = SubsetCache(self.settings, cache_path)
+        self.workers = workers or os.cpu_count() or 1
+        self.simulated = 0
+        self._pool = ProcessPoolExecutor(self.workers) if self.workers > 1 else None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        if self._pool is not None:
+            self._pool.shutdown()
+        self.cache.save()
+
+    def evaluate(self, subsets: Sequence[Subset]) -> List[Dict]:
+        """Results for ``subsets`` (sorted index tuples), simulating only uncached ones."""
+        todo = list(dict.fromkeys(s for s in subsets if s not in self.cache))
+        if todo:
+            s = self.settings
+            jobs = [(truth, n, s["unsure_rate"], seed, "greedy", s["stop_threshold"], subset)
+                    for subset in todo for truth, n, seed in self.shards]
+            if self._pool is None:
+                results = [_run_shard(*job) for job in jobs]
+            else:
+                results = list(self._pool.map(_run_shard, *zip(*jobs)))
+            per = len(self.shards)
+            for i, subset in enumerate(todo):
+                self.cache[subset] = _summarize(results[i * per:(i + 1) * per])
+            self.simulated += len(todo)
+            self.cache.save()
+        return [self.cache[s] for s in subsets]
+
+
+def _summarize(results) -> Dict:
+    totals = np.zeros((len(CHAKRAS), 4))          # sessions, correct, questions, reached
+    for truth, n, correct, questions, reached, _ in results:
+        totals[truth] += (n, correct, questions, reached)
+    n, correct, questions, reached = totals.sum(axis=0)
+    return {"accuracy": correct / n, "avg_questions": questions / n, "reached_threshold": reached / n,
+            "worst_accuracy": float((totals[:, 1] / totals[:, 0]).min())}
+
+
+def _rank(result: Dict):
+    return -result["accuracy"], result["avg_questions"]
+
+
+# -----------------------------
+# Search
+# -----------------------------
+def eliminate(evaluator: Evaluator, max_loss: float = 0.02, min_size: int = 1,
+              progress: Optional[Callable[[Dict], None]] = None) -> Dict:
+    """Greedy backward elimination; returns the full-bank result, the path and drop-one effects."""
+    current: Subset = tuple(range(len(engine.QUESTION_IDS)))
+    full = evaluator.evaluate([current])[0]
+    floor = full["accuracy"] - max_loss
+    path = [{"removed": None, "size": len(current), **full}]
+    drop_one = {}
+    while len(current) > min_size:
+        t0 = time.perf_counter()
+        candidates = [tuple(q for q in current if q != r) for r in current]
+        results = evaluator.evaluate(candidates)
+        if len(current) == len(engine.QUESTION_IDS):
+            for r, res in zip(current, results):
+                drop_one[engine.QUESTION_IDS[r]] = {"accuracy": res["accuracy"] - full["accuracy"],
+                                                    "avg_questions": res["avg_questions"] - full["avg_questions"]}
+        best = min(range(len(candidates)), key=lambda i: _rank(results[i]))
+        if results[best]["accuracy"] < floor:
+            break
+        removed = current[best]
+        current = candidates[best]
+        step = {"removed": engine.QUESTION_IDS[removed], "size": len(current), **results[best]}
+        path.append(step)
+        if progress:
+            progress(dict(step, seconds=time.perf_counter() - t0, evaluated=len(candidates)))
+    return {
+        "settings": dict(evaluator.settings, max_loss=max_loss, min_size=min_size),
+        "full": full,
+        "path": path,
+        "selected": [engine.QUESTION_IDS[q] for q in current],
+        "dropped": [step["removed"] for step in path[1:]],
+        "drop_one": drop_one,
+        "subsets_simulated": evaluator.simulated,
+        "subsets_cached": len(evaluator.cache.entries),
+    }
+
+
+def format_report(result: Dict, questions: List[Dict]) -> str:
+    drop = result["drop_one"]
+    lines = [f"{'question':<22}{'gain':>7}{'spread':>8}{'shared':>12}{'most similar':>26}"
+             f"{'Δacc':>8}{'ΔQs':>7}"]
+    for q in sorted(questions, key=lambda q: -q["gain_bits"]):
+        d = drop.get(q["id"])
+        lines.append(f"{q['id']:<22}{q['gain_bits']:>7.3f}{q['spread']:>8.2f}"
+                     f"{q['shared_value']:>6.2f} × {q['shared_by']}"
+                     f"{q['most_similar'] or '':>20} {q['similarity']:>+5.2f}"
+                     + (f"{d['accuracy']:>+8.1%}{d['avg_questions']:>+7.2f}" if d else ""))
+    lines.append("")
+    lines.append(f"{'removed':<22}{'size':>6}{'accuracy':>10}{'worst':>8}{'avg Qs':>8}{'reached':>9}")
+    for step in result["path"]:
+        lines.append(f"{step['removed'] or '(full bank)':<22}{step['size']:>6}{step['accuracy']:>10.1%}"
+                     f"{step['worst_accuracy']:>8.1%}{step['avg_questions']:>8.2f}{step['reached_threshold']:>9.1%}")
+    s = result["settings"]
+    lines.append(f"selected {len(result['selected'])} of {result['path'][0]['size']} questions within "
+                 f"{s['max_loss']:.1%} accuracy of the full bank ({s['sessions']:,} sessions per chakra, "
+                 f"seed {s['seed']}); {result['subsets_simulated']} subsets simulated, "
+                 f"{result['subsets_cached']} cached")
+    return "\n".join(lines)
+
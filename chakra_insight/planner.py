@@ -0,0 +1,160 @@
+"""Multi-step lookahead question planner.
+
+Greedy selection maximises one-step information gain; the planner instead minimises
+the expected number of further questions until the leading chakra reaches
+``STOP_THRESHOLD`` (or the bank runs out). It searches k answers ahead with
+expectimax over Yes / No / Not sure, restricted to the ``beam`` best candidates by
+information gain, with branch-and-bound pruning and memoized states. Depth grows
+iteratively until the per-request time budget runs out; if not even one level
+completes, the greedy choice is returned.
+
+One planner may serve many sessions at once: the deadline travels down the search as
+an argument, ``last_depth`` is per thread, and the memo is only read with single
+lookups and replaced wholesale when it grows too large.
+"""
+import math
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from . import engine
+from .engine import NO, STOP_THRESHOLD, UNSURE, UNSURE_WEIGHT, YES
+from .knowledge import QUESTIONS
+
+
+class _OutOfTime(Exception):
+    pass
+
+
+def _log_odds(p: float) -> float:
+    p = min(max(p, 1e-12), 1 - 1e-12)
+    return math.log(p / (1 - p))
+
+
+def _logodds_per_answer() -> float:
+    """Average evidence (nats) one answer adds for the true chakra — the heuristic's pace."""
+    like = engine.LIKE
+    mean_yes = like.mean(axis=0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        gain = like * np.log(like / mean_yes) + (1 - like) * np.log((1 - like) / (1 - mean_yes))
+    return float(np.nanmean(gain)) or 1e-3
+
+
+class Planner:
+    """Expected-questions-to-threshold planner with a time budget and greedy fallback."""
+
+    def __init__(self, depth: int = 3, beam: int = 4, budget_s: float = 0.05,
+                 stop_threshold: float = STOP_THRESHOLD, unsure_rate: float = UNSURE_WEIGHT,
+                 memo_size: int = 200_000):
+        self.depth = depth
+        self.beam = beam
+        self.budget_s = budget_s
+        self.stop_threshold = stop_threshold
+        self.unsure_rate = unsure_rate
+        self.memo_size = memo_size
+        self._memo: Dict[Tuple[Tuple[int, ...], int], float] = {}
+        self._target = _log_odds(stop_threshold)
+        self._pace = _logodds_per_answer()
+        self._local = threading.local()
+
+    @property
+    def last_depth(self) -> int:
+        """Depth reached by this thread's most recent choice (0 = greedy)."""
+        return getattr(self._local, "last_depth", 0)
+
+    # -----------------------------
+    # Public API
+    # -----------------------------
+    def choose(self, p: np.ndarray, asked: Iterable[int],
+               history: Optional[Iterable[Tuple[int, int]]] = None) -> Optional[int]:
+        """Next question index for posterior ``p`` given the asked question indices.
+
+        ``history`` ((question, code) pairs) identifies the state for memoization; when
+        omitted, memo entries are keyed by the asked set alone and are not reused.
+        """
+        asked = list(asked)
+        greedy = engine.best_question(p, asked)
+        if greedy is None:
+            return None
+        key = tuple(sorted(q * 3 + c for q, c in history)) if history is not None else None
+        deadline = time.perf_counter() + self.budget_s
+        best, depth = greedy, 0
+        try:
+            for k in range(1, self.depth + 1):
+                best = self._best_action(p, asked, key, k, deadline)[0]
+                depth = k
+        except _OutOfTime:
+            pass
+        self._local.last_depth = depth
+        if len(self._memo) > self.memo_size:
+            self._memo = {}              # swap, never clear: other threads may be reading it
+        return best
+
+    def choose_next_question(self, asked_ids: set, posterior: Dict[str, float],
+                             answers: Optional[Dict[str, str]] = None) -> Optional[Dict]:
+        """Dict-based counterpart of ``engine.choose_next_question``."""
+        asked = [engine.QUESTION_INDEX[q] for q in asked_ids]
+        history = None
+        if answers is not None:
+            history = [(engine.QUESTION_INDEX[q], engine.ANSWER_CODES.get(a, UNSURE))
+                       for q, a in answers.items()]
+        idx = self.choose(engine.to_vector(posterior), asked, history)
+        return None if idx is None else QUESTIONS[idx]
+
+    # -----------------------------
+    # Search
+    # -----------------------------
+    def _final(self, p: np.ndarray, n_asked: int) -> bool:
+        return bool(p.max() >= self.stop_threshold) or n_asked >= len(engine.QUESTION_IDS)
+
+    def _heuristic(self, p: np.ndarray, n_asked: int) -> float:
+        # Questions still needed at the average pace of evidence, at least one.
+        gap = self._target - _log_odds(float(p.max()))
+        remaining = len(engine.QUESTION_IDS) - n_asked
+        return float(min(remaining, max(1.0, gap / self._pace)))
+
+    def _value(self, p: np.ndarray, asked: List[int], key, k: int, deadline: float) -> float:
+        if self._final(p, len(asked)):
+            return 0.0
+        if k == 0:
+            return self._heuristic(p, len(asked))
+        memo_key = (key, k) if key is not None else None
+        if memo_key is not None:
+            value = self._memo.get(memo_key)
+            if value is not None:
+                return value
+        value = self._best_action(p, asked, key, k, deadline)[1]
+        if memo_key is not None:
+            self._memo[memo_key] = value
+        return value
+
+    def _best_action(self, p: np.ndarray, asked: List[int], key, k: int,
+                     deadline: float) -> Tuple[int, float]:
+        if time.perf_counter() > deadline:
+            raise _OutOfTime
+        mask = np.ones(len(engine.QUESTION_IDS), dtype=bool)
+        mask[asked] = False
+        candidates = np.flatnonzero(mask)
+        gains = engine.information_gains(p, candidates)
+        order = candidates[np.argsort(-gains, kind="stable")[: self.beam]]
+
+        best_q, best_v = int(order[0]), math.inf
+        yes_rate = 1.0 - self.unsure_rate
+        for q in order:
+            q = int(q)
+            p_yes = float(p @ engine.LIKE[:, q])
+            branches = ((YES, yes_rate * p_yes), (NO, yes_rate * (1 - p_yes)), (UNSURE, self.unsure_rate))
+            v = 1.0
+            for code, pa in branches:
+                if pa <= 0:
+                    continue
+                child_p = engine.update_vector(p, q, code)
+                child_key = None if key is None else tuple(sorted(key + (q * 3 + code,)))
+                v += pa * self._value(child_p, asked + [q], child_key, k - 1, deadline)
+                if v >= best_v:          # cannot beat the best sibling: prune
+                    break
+            if v < best_v - 1e-12:
+                best_q, best_v = q, v
+        return best_q, best_v
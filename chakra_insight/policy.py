@@ -0,0 +1,208 @@
+"""Precompiled question policy.
+
+Greedy selection is deterministic and every step has only three answers, so the
+adaptive questionnaire is a fixed decision graph. ``PolicyTree`` stores it as flat
+arrays — the question to ask at each node and the child node for each answer code —
+so serving the next question is an index lookup instead of an entropy computation.
+Histories that reach the same set of (question, answer) pairs share a node. Prefixes
+beyond the compiled depth fall back to a bounded LRU of greedy selections.
+"""
+import argparse
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from . import engine
+from .engine import STOP_THRESHOLD
+
+DEFAULT_PATH = os.environ.get(
+    "CHAKRA_POLICY", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chakra_policy.npz"))
+# Depth compiled on startup when no policy file is available.
+STARTUP_DEPTH = 6
+
+ROOT = 0
+STOP = -1        # question[] value: questionnaire is finished at this node
+MISSING = -1     # children[] value: child was not compiled
+
+
+def fingerprint(stop_threshold: float = STOP_THRESHOLD) -> str:
+    """Identifies the bank + threshold a compiled policy was built for."""
+    h = hashlib.sha256()
+    h.update("\n".join(engine.QUESTION_IDS).encode())
+    h.update(np.ascontiguousarray(engine.LIKE).tobytes())
+    h.update(repr(float(stop_threshold)).encode())
+    return h.hexdigest()[:16]
+
+
+def _is_final(p: np.ndarray, n_asked: int, stop_threshold: float) -> bool:
+    return bool(p.max() >= stop_threshold) or n_asked >= len(engine.QUESTION_IDS)
+
+
+def greedy_next(codes: Sequence[int], stop_threshold: float = STOP_THRESHOLD) -> Optional[int]:
+    """Replay an answer history through the greedy policy and return the next question."""
+    p = engine.uniform_vector()
+    asked = []
+    for code in codes:
+        q = engine.best_question(p, asked)
+        if q is None:
+            break
+        asked.append(q)
+        p = engine.update_vector(p, q, code)
+    if _is_final(p, len(asked), stop_threshold):
+        return None
+    return engine.best_question(p, asked)
+
+
+class PolicyTree:
+    """Array-backed greedy policy with an LRU fallback for uncompiled prefixes."""
+
+    def __init__(self, question: np.ndarray, children: np.ndarray,
+                 stop_threshold: float = STOP_THRESHOLD, cache_size: int = 4096):
+        self.question = question
+        self.children = children
+        self.stop_threshold = stop_threshold
+        self.cache_size = cache_size
+        self._memo: "OrderedDict[Tuple[int, ...], Optional[int]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.question)
+
+    # -----------------------------
+    # Compile / persist
+    # -----------------------------
+    @classmethod
+    def compile(cls, max_depth: Optional[int] = None, stop_threshold: float = STOP_THRESHOLD,
+                cache_size: int = 4096) -> "PolicyTree":
+        """Expand the greedy policy breadth-first down to ``max_depth`` answers."""
+        n_questions = len(engine.QUESTION_IDS)
+        depth_limit = n_questions if max_depth is None else min(max_depth, n_questions)
+        question = [STOP]
+        children = [[MISSING] * 3]
+        index: Dict[Tuple[int, ...], int] = {(): ROOT}
+        frontier = [((), engine.uniform_vector(), ())]   # (key, posterior, asked)
+        for depth in range(depth_limit + 1):
+            next_frontier = []
+            for key, p, asked in frontier:
+                node = index[key]
+                if _is_final(p, len(asked), stop_threshold):
+                    continue
+                q = engine.best_question(p, asked)
+                question[node] = q
+                if depth == depth_limit:
+                    continue
+                for code in range(3):
+                    child_key = tuple(sorted(key + (q * 3 + code,)))
+                    child = index.get(child_key)
+                    if child is None:
+                        child = index[child_key] = len(question)
+                        question.append(STOP)
+                        children.append([MISSING] * 3)
+                        next_frontier.append((child_key, engine.update_vector(p, q, code), asked + (q,)))
+                    children[node][code] = child
+            frontier = next_frontier
+        return cls(np.asarray(question, dtype=np.int16), np.asarray(children, dtype=np.int32),
+                   stop_threshold, cache_size)
+
+    def save(self, path: str) -> None:
+        np.savez(path, question=self.question, children=self.children,
+                 stop_threshold=np.float64(self.stop_threshold),
+                 fingerprint=np.bytes_(fingerprint(self.stop_threshold)))
+
+    @classmethod
+    def load(cls, path: str, cache_size: int = 4096,
+             stop_threshold: float = STOP_THRESHOLD) -> "PolicyTree":
+        """Load a compiled policy; it must match the bank and the serving ``stop_threshold``."""
+        with np.load(path) as data:
+            compiled_for = float(data["stop_threshold"])
+            if compiled_for != float(stop_threshold):
+                raise ValueError(f"{path} was compiled for stop threshold {compiled_for:g}, "
+                                 f"not {float(stop_threshold):g}")
+            if data["fingerprint"].item().decode() != fingerprint(compiled_for):
+                raise ValueError(f"{path} was compiled for a different question bank")
+            return cls(data["question"], data["children"], compiled_for, cache_size)
+
+    # -----------------------------
+    # Serving
+    # -----------------------------
+    def node_for(self, codes: Sequence[int]) -> int:
+        """Node reached by an answer history, or MISSING if it was not compiled."""
+        node = ROOT
+        for code in codes:
+            if self.question[node] == STOP:
+                return node
+            node = int(self.children[node, code])
+            if node == MISSING:
+                return MISSING
+        return node
+
+    def next_question(self, codes: Sequence[int]) -> Optional[int]:
+        """Index of the next question for an answer history, or None when finished."""
+        node = self.node_for(codes)
+        if node == MISSING:
+            return self.replay(codes)[1]
+        q = int(self.question[node])
+        return None if q == STOP else q
+
+    def replay(self, codes: Sequence[int]) -> Tuple[List[int], Optional[int], np.ndarray]:
+        """Questions asked for an answer history, the next one (None when finished) and
+        the posterior.
+
+        Raises ValueError if the history runs past the end of the questionnaire.
+        """
+        asked: List[int] = []
+        node = ROOT
+        p = engine.uniform_vector()
+        for i, code in enumerate(codes):
+            q = self._question_at(node, codes, i, p, asked)
+            if q is None:
+                raise ValueError("answer history continues past the end of the questionnaire")
+            asked.append(q)
+            p = engine.update_vector(p, q, code)
+            node = MISSING if node == MISSING else int(self.children[node, code])
+        return asked, self._question_at(node, codes, len(codes), p, asked), p
+
+    def _question_at(self, node: int, codes: Sequence[int], depth: int,
+                     p: np.ndarray, asked: List[int]) -> Optional[int]:
+        if node != MISSING:
+            q = int(self.question[node])
+            return None if q == STOP else q
+        # Past the compiled depth: greedy choice from the replayed state, kept in an LRU.
+        key = tuple(codes[:depth])
+        with self._lock:
+            if key in self._memo:
+                self._memo.move_to_end(key)
+                return self._memo[key]
+        q = None if _is_final(p, len(asked), self.stop_threshold) else engine.best_question(p, asked)
+        with self._lock:
+            self._memo[key] = q
+            if len(self._memo) > self.cache_size:
+                self._memo.popitem(last=False)
+        return q
+
+
+def load_default(path: str = DEFAULT_PATH, stop_threshold: float = STOP_THRESHOLD) -> PolicyTree:
+    """The compiled policy at ``path``; if missing or stale, compile the first levels now."""
+    try:
+        return PolicyTree.load(path, stop_threshold=stop_threshold)
+    except (OSError, ValueError):
+        return PolicyTree.compile(max_depth=STARTUP_DEPTH, stop_threshold=stop_threshold)
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Compile the greedy question policy to an .npz file.")
+    ap.add_argument("out", help="output path (.npz)")
+    ap.add_argument("--max-depth", type=int, default=8, help="answers to expand (default: 8)")
+    ap.add_argument("--threshold", type=float, default=STOP_THRESHOLD)
+    args = ap.parse_args(argv)
+    tree = PolicyTree.compile(args.max_depth, args.threshold)
+    tree.save(args.out)
+    print(f"{len(tree)} nodes → {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,211 @@
+"""PDF "Chakra Insight Report" rendering.
+
+ReportLab is imported on first render, never at package import. The logo is read from
+a local file — ``$CHAKRA_LOGO`` when set (e.g. an offline placeholder), otherwise a copy
+of ``LOGO_URL`` downloaded once into the user cache dir (never when ``$CHAKRA_OFFLINE``
+is set) — and decoded once per process.
+Rendering in the background and caching finished reports on disk is done by
+``report_queue.ReportQueue`` and ``report_queue.ReportCache``.
+"""
+import copy
+import datetime
+import io
+import os
+import urllib.request
+from functools import lru_cache
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from xml.sax.saxutils import escape
+
+from . import metrics
+from .insight import chakra_from_birth, make_summary, parse_dob
+from .knowledge import CHAKRA_COLORS, LOGO_URL, REMEDIES
+
+
+# -----------------------------
+# Logo
+# -----------------------------
+def _cache_dir() -> str:
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "chakra_insight")
+
+
+def logo_path(download: bool = True) -> Optional[str]:
+    """Local path of the logo, fetching ``LOGO_URL`` once if needed; None if unavailable."""
+    explicit = os.environ.get("CHAKRA_LOGO")
+    if explicit:
+        return explicit if os.path.exists(explicit) else None
+    path = os.path.join(_cache_dir(), "logo.jpg")
+    if os.path.exists(path):
+        return path
+    if not download or os.environ.get("CHAKRA_OFFLINE"):
+        return None
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.part"
+        with urllib.request.urlopen(LOGO_URL, timeout=10) as resp, open(tmp, "wb") as fh:
+            fh.write(resp.read())
+        os.replace(tmp, path)
+        return path
+    except OSError:
+        return None
+
+
+@lru_cache(maxsize=1)
+def load_logo():
+    """Decoded logo as a ReportLab ImageReader (cached for the process), or None."""
+    from reportlab.lib.utils import ImageReader
+
+    path = logo_path()
+    if path is None:
+        return None
+    try:
+        return ImageReader(path)
+    except Exception:
+        return None
+
+
+# -----------------------------
+# Rendering
+# -----------------------------
+def pdf_color(hexcol):
+    from reportlab.lib import colors as rlcolors
+
+    r = int(hexcol[1:3],16)/255; g = int(hexcol[3:5],16)/255; b = int(hexcol[5:7],16)/255
+    return rlcolors.Color(r,g,b)
+
+
+MARGIN = 40
+# Frame() default padding; fragments are placed exactly where a Frame would put them.
+_PAD = 6
+_GUIDANCE = (
+    # (label, REMEDIES key; None = crystal + shop link)
+    ("Why now", "why"),
+    ("Do this next", "do"),
+    ("Crystal", None),
+    ("Affirmation", "affirm"),
+    ("Mudra", "mudra"),
+    ("Essential oil", "oil"),
+    ("Food focus", "food"),
+    ("Journal prompt", "journal"),
+    ("Mini-ritual", "ritual"),
+)
+
+
+@lru_cache(maxsize=1)
+def _body_style():
+    from reportlab.lib.styles import getSampleStyleSheet
+
+    style = getSampleStyleSheet()['BodyText']; style.fontName = 'Helvetica'; style.leading = 13
+    return style
+
+
+def _page_size():
+    from reportlab.lib.pagesizes import A4
+
+    return A4
+
+
+def _flowed(markup: str):
+    """Paragraph wrapped to the report's text width: (paragraph, height)."""
+    from reportlab.platypus import Paragraph
+
+    W, _ = _page_size()
+    p = Paragraph(markup, _body_style())
+    return p, p.wrap(W - 2*MARGIN - 2*_PAD, 10**6)[1]
+
+
+@lru_cache(maxsize=None)
+def chakra_template(winner: str):
+    """Pre-flowed guidance fragments for one chakra, built once per process.
+
+    Each entry is (paragraph, height); paragraphs are already wrapped, so a report only
+    has to ``drawOn`` them. They are shared between threads, so ``generate_pdf`` draws a
+    shallow copy: ``drawOn`` sets and then deletes the paragraph's ``canv``.
+    """
+    d = REMEDIES[winner]
+    fragments = []
+    for label, key in _GUIDANCE:
+        value = f"{d['crystal']}  (Shop: {d['link']})" if key is None else d[key]
+        fragments.append(_flowed(f"<b>{label}:</b> {value}"))
+    return tuple(fragments)
+
+
+@metrics.timed("generate_pdf")
+def generate_pdf(buf: BinaryIO, ordered: List[Tuple[str, float]], summary_text: str,
+                 name: str = "", email: str = "", dob: Optional[datetime.date] = None) -> None:
+    """Write the report for a finished session; ``ordered`` is (chakra, prob) sorted desc.
+
+    Only the details line, the probability bars and the summary are laid out per
+    report; the guidance block comes pre-flowed from ``chakra_template``.
+    """
+    from reportlab.pdfgen import canvas as pdfcanvas
+    from reportlab.lib import colors as rlcolors
+
+    winner, conf = ordered[0]
+    W, H = _page_size()
+    MLEFT, MRIGHT, MTOP, MBOT = MARGIN, MARGIN, MARGIN, MARGIN
+    c = pdfcanvas.Canvas(buf, pagesize=(W, H))
+
+    # Header
+    img = load_logo()
+    if img is not None:
+        c.drawImage(img, MLEFT, H-MTOP-60, width=160, height=60, preserveAspectRatio=True, mask='auto')
+    c.setFont("Helvetica-Bold", 18); c.drawString(MLEFT+180, H-MTOP-10, "Chakra Insight Report")
+    c.setFont("Helvetica", 10)
+    c.drawString(MLEFT+180, H-MTOP-25, f"Top Insight: {winner} (confidence {conf:.0%})")
+    c.drawString(MLEFT, H-MTOP-85, f"Name: {name or '-'}")
+    c.drawString(MLEFT+180, H-MTOP-85, f"Email: {email or '-'}")
+    c.drawString(MLEFT+360, H-MTOP-85, f"DOB: {dob if dob else '-'}")
+
+    # Bars
+    c.setFont("Helvetica-Bold", 12); c.drawString(MLEFT, H-MTOP-105, "Profile")
+    y = H-MTOP-120
+    for c_name, p in ordered:
+        pct = int(p*100)
+        c.setFont("Helvetica", 10); c.drawString(MLEFT, y+4, c_name)
+        c.setFillColor(rlcolors.Color(0.92,0.92,0.92)); c.roundRect(MLEFT+160, y, 300, 12, 4, fill=True, stroke=0)
+        c.setFillColor(pdf_color(CHAKRA_COLORS[c_name])); c.roundRect(MLEFT+160, y, 3*pct, 12, 4, fill=True, stroke=0)
+        c.setFillColor(rlcolors.black); c.drawRightString(MLEFT+470, y+4, f"{pct}%")
+        y -= 18
+
+    def place(fragment, y, title=None):
+        # Draw a wrapped paragraph at the top of the remaining space, breaking the page
+        # (and repeating the section title) when it would run into the bottom margin.
+        para, h = fragment
+        if y - h < MBOT + 40:
+            c.showPage()
+            y = H-MTOP-40
+            if title:
+                c.setFont("Helvetica-Bold", 12); c.drawString(MLEFT, y, title)
+                y -= 20
+        copy.copy(para).drawOn(c, MLEFT+_PAD, y-_PAD-h)
+        return y - max(24, h+6)
+
+    # Soulful Summary
+    c.setFont("Helvetica-Bold", 12); c.drawString(MLEFT, y-10, "Soulful Summary")
+    y -= 26
+    y = place(_flowed(summary_text.replace("\n", " ")), y)
+
+    # Guidance (ordered labels, auto page-break)
+    c.setFont("Helvetica-Bold", 12); c.drawString(MLEFT, y-10, "Personalized Guidance")
+    y -= 26
+    for fragment in chakra_template(winner):
+        y = place(fragment, y, "Personalized Guidance")
+
+    c.showPage(); c.save()
+
+
+def write_report(fh: BinaryIO, posterior: Dict[str, float], name: str = "", email: str = "", dob=None) -> None:
+    """Write the PDF for a final posterior to ``fh``, with the summary the results page shows."""
+    dob = parse_dob(dob)
+    ordered = sorted(posterior.items(), key=lambda kv: kv[1], reverse=True)
+    # The summary is Paragraph markup, so a typed "<" or "&" must not reach it raw
+    summary_text = make_summary(escape(name) or "Dear Soul", chakra_from_birth(dob), ordered[0][0], ordered)
+    generate_pdf(fh, ordered, summary_text, name, email, dob)
+
+
+def render_report(posterior: Dict[str, float], name: str = "", email: str = "", dob=None) -> bytes:
+    """PDF bytes for a final posterior (``write_report`` into memory)."""
+    buf = io.BytesIO()
+    write_report(buf, posterior, name, email, dob)
+    return buf.getvalue()
@@ -0,0 +1,189 @@
+"""Background PDF rendering for the results page, with an on-disk report cache.
+
+``ReportQueue.submit`` is called as soon as a session is finished. It returns a ``Job``
+at once, and a small thread pool renders the report (including the first-time logo
+download) while the page goes on drawing. Jobs are keyed by what the report shows:
+the final posterior, name, email and date of birth. Resubmitting therefore returns the
+running or finished job instead of rendering twice. A failed job is kept too, so polling
+reports the failure once; only ``submit(..., retry=True)`` renders it again.
+
+Reports are written straight to files in a ``ReportCache`` directory
+(``$CHAKRA_REPORT_DIR``, default ``<user cache>/chakra_insight/reports``), so no copy
+is held in memory. The cache is bounded in total size (``$CHAKRA_REPORT_CACHE_MB``,
+default 200) and age (``$CHAKRA_REPORT_TTL`` seconds, default one day). Expired files
+go first, then the oldest, and an evicted report is simply rendered again.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import BinaryIO, Callable, Dict, Optional
+
+from . import metrics
+from .report import _cache_dir, load_logo, write_report
+
+DEFAULT_DIR = os.environ.get("CHAKRA_REPORT_DIR") or os.path.join(_cache_dir(), "reports")
+DEFAULT_MAX_BYTES = int(float(os.environ.get("CHAKRA_REPORT_CACHE_MB", "200")) * 1024 * 1024)
+DEFAULT_TTL = float(os.environ.get("CHAKRA_REPORT_TTL", "86400"))
+WORKERS = 2
+MAX_JOBS = 1024                   # job records kept for status lookups
+
+QUEUED, RUNNING, DONE, FAILED = "queued", "running", "done", "failed"
+
+
+def report_key(posterior: Dict[str, float], name: str = "", email: str = "", dob=None) -> str:
+    data = json.dumps([sorted((c, round(p, 9)) for c, p in posterior.items()), name, email,
+                       str(dob) if dob else None], ensure_ascii=False)
+    return hashlib.sha256(data.encode()).hexdigest()[:32]
+
+
+class ReportCache:
+    """``<key>.pdf`` files in one directory, bounded by total size and age."""
+
+    def __init__(self, directory: str = DEFAULT_DIR, max_bytes: int = DEFAULT_MAX_BYTES,
+                 ttl: float = DEFAULT_TTL):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        os.makedirs(directory, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pdf")
+
+    def get(self, key: str) -> Optional[str]:
+        """Path of the cached report if it has not expired, else None."""
+        path = self.path(key)
+        try:
+            if time.time() - os.stat(path).st_mtime > self.ttl:
+                os.remove(path)
+                return None
+        except OSError:
+            return None
+        return path
+
+    def put(self, key: str, write: Callable[[BinaryIO], None]) -> str:
+        """Write a report with ``write(fh)``, atomically, then evict; returns its path."""
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp, "wb") as fh:
+                write(fh)
+            os.replace(tmp, path)
+        finally:
+            if os.path.exists(tmp):
+                os.remove(tmp)
+        self.evict(keep=path)
+        return path
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Remove expired reports, then the oldest ones while over the size bound."""
+        removed = 0
+        with self._lock:
+            now = time.time()
+            files = []
+            for entry in os.scandir(self.directory):
+                if not entry.name.endswith(".pdf"):
+                    continue
+                try:
+                    st = entry.stat()
+                except OSError:
+                    continue
+                if now - st.st_mtime > self.ttl and entry.path != keep:
+                    removed += _remove(entry.path)
+                else:
+                    files.append((st.st_mtime, st.st_size, entry.path))
+            total = sum(size for _, size, _ in files)
+            for _, size, path in sorted(files):
+                if total <= self.max_bytes:
+                    break
+                if path != keep:
+                    removed += _remove(path)
+                    total -= size
+        return removed
+
+
+def _remove(path: str) -> int:
+    try:
+        os.remove(path)
+        return 1
+    except OSError:
+        return 0
+
+
+class Job:
+    """One report; ``progress`` runs from 0 to 1 and ``stage`` says what is happening."""
+
+    __slots__ = ("key", "args", "state", "stage", "progress", "path", "error")
+
+    def __init__(self, key: str, args: tuple):
+        self.key = key
+        self.args = args
+        self.state = QUEUED
+        self.stage = "waiting"
+        self.progress = 0.0
+        self.path: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.state in (DONE, FAILED)
+
+
+class ReportQueue:
+    """Renders reports on a thread pool into a ``ReportCache``."""
+
+    def __init__(self, cache: Optional[ReportCache] = None, workers: int = WORKERS):
+        self.cache = cache or ReportCache()
+        self._pool = ThreadPoolExecutor(workers, thread_name_prefix="chakra-report")
+        self._jobs: "OrderedDict[str, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def submit(self, posterior: Dict[str, float], name: str = "", email: str = "", dob=None,
+               retry: bool = False) -> Job:
+        """The job for this report: running, finished, or started now.
+
+        A failed job is returned as it is unless ``retry`` is set; a done job whose file
+        has been evicted is rendered again.
+        """
+        key = report_key(posterior, name, email, dob)
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and (not job.finished or job.state == FAILED and not retry
+                                    or job.state == DONE and os.path.exists(job.path)):
+                self._jobs.move_to_end(key)
+                return job
+            job = Job(key, (dict(posterior), name, email, dob))
+            path = self.cache.get(key)
+            if path is not None:
+                job.state, job.stage, job.progress, job.path = DONE, "ready", 1.0, path
+            else:
+                self._pool.submit(self._render, job)
+            self._jobs[key] = job
+            while len(self._jobs) > MAX_JOBS:
+                self._jobs.popitem(last=False)
+        return job
+
+    def open(self, job: Job) -> Optional[BinaryIO]:
+        """The finished report as an open file, or None if it has been evicted since."""
+        path = self.cache.get(job.key) if job.state == DONE else None
+        if path is None:
+            return None
+        try:
+            return open(path, "rb")
+        except OSError:
+            return None
+
+    def _render(self, job: Job) -> None:
+        job.state, job.stage, job.progress = RUNNING, "loading the logo", 0.1
+        try:
+            load_logo()                                  # may download it, once per process
+            job.stage, job.progress = "laying out pages", 0.4
+            with metrics.span("report_job"):
+                job.path = self.cache.put(job.key, lambda fh: write_report(fh, *job.args))
+            job.state, job.stage, job.progress = DONE, "ready", 1.0
+        except Exception as exc:                         # shown on the page; the user may retry
+            job.state, job.stage, job.error = FAILED, "failed", f"{type(exc).__name__}: {exc}"
@@ -0,0 +1,141 @@
+"""Shared quiz engine and compact per-session state for the Streamlit app.
+
+One ``Engine`` per process holds everything that is the same for every user: the
+read-only likelihood matrix, the question index, the remedies, the compiled policy
+and the optional planner. A ``SessionState`` holds only what differs per user: the
+asked question indices and answer codes as small integer arrays, the posterior as a
+fixed float array and the current policy node. So per-session memory and the work done
+per rerun do not grow with the number of concurrent sessions.
+"""
+import itertools
+from types import MappingProxyType
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from . import engine
+from .engine import ANSWER_CODES, ANSWERS, STOP_THRESHOLD, UNSURE
+from .knowledge import CHAKRAS, QUESTIONS, REMEDIES
+
+
+def _frozen(a: np.ndarray) -> np.ndarray:
+    view = a.view()
+    view.flags.writeable = False
+    return view
+
+
+class SessionState:
+    """Answer history and posterior of one user, in a few hundred bytes."""
+
+    __slots__ = ("asked", "codes", "n", "posterior", "node", "engine_version")
+
+    def __init__(self, n_questions: int, prior: np.ndarray, engine_version: int = 0):
+        self.asked = np.full(n_questions, -1, dtype=np.int16)
+        self.codes = np.full(n_questions, -1, dtype=np.int8)
+        self.n = 0
+        self.posterior = prior.copy()
+        self.node = 0            # policy node, MISSING once past the compiled depth
+        self.engine_version = engine_version
+
+    @property
+    def asked_indices(self) -> np.ndarray:
+        return self.asked[: self.n]
+
+    @property
+    def answer_codes(self) -> np.ndarray:
+        return self.codes[: self.n]
+
+    def winner(self) -> Tuple[int, float]:
+        i = int(self.posterior.argmax())
+        return i, float(self.posterior[i])
+
+
+_versions = itertools.count(1)
+
+
+class Engine:
+    """Process-wide, immutable quiz data plus question selection and updates.
+
+    Build a new ``Engine`` after ``engine.set_likelihoods``. Sessions started under an
+    older one continue with greedy selection from their own posterior, because its
+    policy nodes mean nothing in the new policy.
+    """
+
+    def __init__(self, policy=None, planner=None, stop_threshold: float = STOP_THRESHOLD):
+        if policy is not None and policy.stop_threshold != stop_threshold:
+            raise ValueError(f"policy was compiled for stop threshold {policy.stop_threshold:g}, "
+                             f"not {stop_threshold:g}")
+        self.chakras: Tuple[str, ...] = tuple(CHAKRAS)
+        self.questions: Tuple[Dict, ...] = tuple(MappingProxyType(q) for q in QUESTIONS)
+        self.question_ids: Tuple[str, ...] = tuple(engine.QUESTION_IDS)
+        self.question_index = MappingProxyType(dict(engine.QUESTION_INDEX))
+        self.remedies = MappingProxyType({c: MappingProxyType(r) for c, r in REMEDIES.items()})
+        self.like = _frozen(engine.LIKE)
+        self.prior = _frozen(engine.uniform_vector())
+        self.policy = policy
+        self.planner = planner
+        self.stop_threshold = stop_threshold
+        self.version = next(_versions)
+
+    # -----------------------------
+    # Sessions
+    # -----------------------------
+    def new_session(self) -> SessionState:
+        return SessionState(len(self.question_ids), self.prior, self.version)
+
+    def finished(self, s: SessionState) -> bool:
+        return bool(s.posterior.max() >= self.stop_threshold) or s.n >= len(self.question_ids)
+
+    def next_question(self, s: SessionState) -> Optional[int]:
+        """Index of the question to ask next, or None when the session is finished."""
+        if self.finished(s):
+            return None
+        asked = s.asked_indices
+        if self.planner is not None:
+            return self.planner.choose(s.posterior, asked.tolist(),
+                                       zip(asked.tolist(), s.answer_codes.tolist()))
+        if self.policy is not None and s.engine_version == self.version:
+            from .policy import MISSING, STOP
+
+            if s.node != MISSING:
+                q = int(self.policy.question[s.node])
+                return None if q == STOP else q
+            # Past the compiled depth: the policy's LRU, keyed by the answer history
+            return self.policy.next_question(s.answer_codes.tolist())
+        return engine.best_question(s.posterior, asked)
+
+    def answer(self, s: SessionState, qidx: int, answer: str) -> bool:
+        """Record ``answer`` to question ``qidx`` and update the posterior in place.
+
+        Returns False, changing nothing, when the session is finished or ``qidx`` was
+        already answered (a stale or repeated button click).
+        """
+        if self.finished(s) or qidx in s.asked_indices:
+            return False
+        code = ANSWER_CODES.get(answer, UNSURE)
+        s.asked[s.n] = qidx
+        s.codes[s.n] = code
+        s.n += 1
+        s.posterior = engine.update_vector(s.posterior, qidx, code)
+        if self.policy is not None and s.engine_version == self.version:
+            from .policy import MISSING
+
+            if s.node != MISSING:
+                s.node = int(self.policy.children[s.node, code])
+        return True
+
+    # -----------------------------
+    # Views for rendering and reports
+    # -----------------------------
+    def posterior_dict(self, s: SessionState) -> Dict[str, float]:
+        return engine.to_dict(s.posterior)
+
+    def history(self, s: SessionState) -> Tuple[Tuple[str, str], ...]:
+        """(question id, answer) pairs in the order asked."""
+        return tuple((self.question_ids[q], ANSWERS[c])
+                     for q, c in zip(s.asked_indices.tolist(), s.answer_codes.tolist()))
+
+    def log(self, s: SessionState) -> List[Tuple[str, str]]:
+        """(question text, answer) pairs for the session log."""
+        return [(self.questions[q]["text"], ANSWERS[c])
+                for q, c in zip(s.asked_indices.tolist(), s.answer_codes.tolist())]
@@ -0,0 +1,155 @@
+"""Monte Carlo respondent simulator and accuracy / efficiency benchmark.
+
+For each true chakra, synthetic respondents answer every question "Yes" with the
+probability in ``LIKELIHOODS`` (and "Not sure" at a configurable rate). They go through
+the real selection and update loop — ``engine.best_question`` and
+``engine.update_vector``, or the compiled ``PolicyTree`` — until the app would stop.
+
+Work is cut into fixed-size shards, each with its own child of one ``SeedSequence``,
+and spread over a process pool. Accuracy and question counts therefore depend only
+on the seed and the sizes, never on the worker count; wall times are measured.
+"""
+import os
+import time
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+
+from . import engine
+from .engine import NO, STOP_THRESHOLD, UNSURE, YES
+from .knowledge import CHAKRAS
+
+SHARD_SIZE = 2_000
+SELECTORS = ("greedy", "policy")
+
+
+@lru_cache(maxsize=2)
+def _policy(stop_threshold: float):
+    from .policy import load_default
+
+    return load_default(stop_threshold=stop_threshold)
+
+
+def _run_shard(truth: int, n: int, unsure_rate: float, seed: np.random.SeedSequence,
+               selector: str, stop_threshold: float,
+               questions: Optional[Tuple[int, ...]] = None) -> Tuple[int, int, int, int, int, float]:
+    """Simulate ``n`` sessions of one true chakra in lockstep; returns summed counters.
+
+    Every step selects and applies one question for all still-running sessions through
+    ``engine.batch_best_questions`` / ``engine.batch_update`` — the same gain and
+    update math the app uses, just stacked. ``questions`` restricts the greedy selector
+    to a subset of the bank (question indices).
+    """
+    rng = np.random.default_rng(seed)
+    n_questions = len(engine.QUESTION_IDS)
+    # One draw per (session, question): each question is asked at most once.
+    unsure_draws = rng.random((n, n_questions))
+    yes_draws = rng.random((n, n_questions))
+    like = engine.LIKE[truth]
+    tree = None
+    if selector == "policy":
+        from .policy import MISSING, STOP
+
+        tree = _policy(stop_threshold)
+        nodes = np.zeros(n, dtype=np.int64)
+
+    t0 = time.perf_counter()
+    P = np.tile(engine.uniform_vector(), (n, 1))
+    asked = np.zeros((n, n_questions), dtype=bool)
+    limit = n_questions
+    if questions is not None:            # questions outside the subset count as asked
+        asked[:] = True
+        asked[:, list(questions)] = False
+        limit = len(questions)
+    n_asked = np.zeros(n, dtype=np.int64)
+    active = np.arange(n)
+    while active.size:
+        Pa = P[active]
+        if tree is not None:
+            na = nodes[active]
+            compiled = na != MISSING
+            q = np.where(compiled, tree.question[np.maximum(na, 0)], MISSING).astype(np.int64)
+            if (~compiled).any():
+                q[~compiled] = engine.batch_best_questions(Pa[~compiled], asked[active[~compiled]])
+            q[compiled & (q == STOP)] = -1
+        else:
+            q = engine.batch_best_questions(Pa, asked[active])
+        going = q >= 0
+        active, q, Pa = active[going], q[going], Pa[going]
+        if not active.size:
+            break
+        codes = np.where(unsure_draws[active, q] < unsure_rate, UNSURE,
+                         np.where(yes_draws[active, q] < like[q], YES, NO))
+        asked[active, q] = True
+        n_asked[active] += 1
+        P[active] = engine.batch_update(Pa, q, codes)
+        if tree is not None:
+            na = nodes[active]
+            nodes[active] = np.where(na != MISSING, tree.children[np.maximum(na, 0), codes], MISSING)
+        done = (P[active].max(axis=1) >= stop_threshold) | (n_asked[active] >= limit)
+        active = active[~done]
+    seconds = time.perf_counter() - t0
+
+    correct = int((P.argmax(axis=1) == truth).sum())
+    reached = int((P.max(axis=1) >= stop_threshold).sum())
+    return truth, n, correct, int(n_asked.sum()), reached, seconds
+
+
+def shards(sessions_per_chakra: int, seed: int):
+    """(truth, sessions, seed) per shard; the same layout for every run with this seed."""
+    root = np.random.SeedSequence(seed)
+    for truth, chakra_seed in enumerate(root.spawn(len(CHAKRAS))):
+        sizes = [SHARD_SIZE] * (sessions_per_chakra // SHARD_SIZE)
+        if sessions_per_chakra % SHARD_SIZE:
+            sizes.append(sessions_per_chakra % SHARD_SIZE)
+        for n, shard_seed in zip(sizes, chakra_seed.spawn(len(sizes))):
+            yield truth, n, shard_seed
+
+
+def simulate(sessions_per_chakra: int, unsure_rate: float = 0.05, seed: int = 0,
+             workers: Optional[int] = None, selector: str = "greedy",
+             stop_threshold: float = STOP_THRESHOLD) -> Dict:
+    """Run the simulation; returns per-chakra and overall accuracy / questions / timing."""
+    if selector not in SELECTORS:
+        raise ValueError(f"selector must be one of {SELECTORS}")
+    jobs = [(truth, n, unsure_rate, shard_seed, selector, stop_threshold)
+            for truth, n, shard_seed in shards(sessions_per_chakra, seed)]
+
+    workers = workers or os.cpu_count() or 1
+    t0 = time.perf_counter()
+    if workers == 1:
+        results = [_run_shard(*job) for job in jobs]
+    else:
+        with ProcessPoolExecutor(workers) as pool:
+            results = list(pool.map(_run_shard, *zip(*jobs)))
+    wall = time.perf_counter() - t0
+
+    totals = np.zeros((len(CHAKRAS), 5))          # sessions, correct, questions, reached, cpu s
+    for truth, *counts in results:
+        totals[truth] += counts
+    per_chakra = {}
+    for c, (n, correct, questions, reached, cpu) in zip(CHAKRAS, totals):
+        per_chakra[c] = {"sessions": int(n), "accuracy": correct / n, "avg_questions": questions / n,
+                         "reached_threshold": reached / n, "ms_per_session": cpu / n * 1000}
+    n, correct, questions, reached, cpu = totals.sum(axis=0)
+    return {
+        "selector": selector, "seed": seed, "unsure_rate": unsure_rate, "workers": workers,
+        "per_chakra": per_chakra,
+        "overall": {"sessions": int(n), "accuracy": correct / n, "avg_questions": questions / n,
+                    "reached_threshold": reached / n, "ms_per_session": cpu / n * 1000,
+                    "wall_seconds": wall, "sessions_per_sec": n / wall if wall else 0.0},
+    }
+
+
+def format_report(result: Dict) -> str:
+    lines = [f"{'chakra':<26}{'sessions':>10}{'accuracy':>10}{'avg Qs':>8}{'reached':>9}{'ms/sess':>9}"]
+    rows = list(result["per_chakra"].items()) + [("overall", result["overall"])]
+    for name, r in rows:
+        lines.append(f"{name:<26}{r['sessions']:>10,}{r['accuracy']:>10.1%}{r['avg_questions']:>8.2f}"
+                     f"{r['reached_threshold']:>9.1%}{r['ms_per_session']:>9.3f}")
+    o = result["overall"]
+    lines.append(f"{o['sessions']:,} sessions in {o['wall_seconds']:.1f}s on {result['workers']} workers "
+                 f"({o['sessions_per_sec']:,.0f}/s), selector={result['selector']}, seed={result['seed']}")
+    return "\n".join(lines)
@@ -0,0 +1,161 @@
+"""Non-blocking persistence of completed sessions to SQLite.
+
+``SessionStore.submit`` only puts the record on a bounded queue; one background thread
+drains it and writes batches with ``executemany`` in a single transaction. The database
+runs in WAL mode, so readers (analytics, exports) never block the writer. When the queue
+is full, ``submit`` waits — backpressure — up to its timeout, then drops the record and
+counts it. A batch that fails to commit is retried a few times; if it still fails, its
+rows are counted as ``failed`` and logged, and the writer carries on with the next batch.
+``close`` (also registered with ``atexit``) flushes what is queued.
+"""
+import atexit
+import datetime
+import json
+import os
+import queue
+import sqlite3
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_PATH = os.environ.get(
+    "CHAKRA_DB", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "chakra_sessions.db"))
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    id          INTEGER PRIMARY KEY AUTOINCREMENT,
+    created_at  TEXT NOT NULL,
+    name        TEXT,
+    email       TEXT,
+    phone       TEXT,
+    dob         TEXT,
+    answers     TEXT NOT NULL,      -- JSON [[question id, answer], ...] in the order asked
+    posterior   TEXT NOT NULL,      -- JSON {chakra: probability}
+    winner      TEXT NOT NULL,
+    confidence  REAL NOT NULL,
+    questions   INTEGER NOT NULL
+)
+"""
+COLUMNS = ("created_at", "name", "email", "phone", "dob", "answers", "posterior", "winner",
+           "confidence", "questions")
+_INSERT = f"INSERT INTO sessions ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))})"
+_STOP = object()
+RETRY_DELAYS = (0.05, 0.2, 1.0)     # seconds before each retry of a failed batch
+
+
+def connect(path: str = DEFAULT_PATH) -> sqlite3.Connection:
+    """Connection with the sessions table in place and WAL journaling on."""
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")     # durable at checkpoints; safe with WAL
+    conn.execute(SCHEMA)
+    conn.commit()
+    return conn
+
+
+def make_record(answers: Sequence[Tuple[str, str]], posterior: Dict[str, float], name: str = "",
+                email: str = "", phone: str = "", dob=None,
+                created_at: Optional[datetime.datetime] = None) -> Tuple:
+    """Row tuple (in ``COLUMNS`` order) for one completed session."""
+    winner = max(posterior, key=posterior.get)
+    created_at = created_at or datetime.datetime.now(datetime.timezone.utc)
+    return (created_at.isoformat(timespec="seconds"), name or None, email or None, phone or None,
+            str(dob) if dob else None, json.dumps([list(a) for a in answers]),
+            json.dumps({c: round(float(p), 6) for c, p in posterior.items()}),
+            winner, float(posterior[winner]), len(answers))
+
+
+class SessionStore:
+    """Bounded queue plus one writer thread that batches inserts."""
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 500, max_queue: int = 10_000):
+        self.path = path
+        self.batch_size = batch_size
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0                  # rows lost to batches that could not be committed
+        self.last_error: Optional[BaseException] = None
+        self._queue: "queue.Queue" = queue.Queue(maxsize=max_queue)
+        self._conn = connect(path)
+        self._thread = threading.Thread(target=self._run, name="chakra-session-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, record: Tuple, timeout: Optional[float] = 1.0) -> bool:
+        """Queue a ``make_record`` row; False if it was dropped because the queue stayed full."""
+        try:
+            self._queue.put(record, timeout=timeout)
+            return True
+        except queue.Full:
+            self.dropped += 1
+            return False
+
+    def flush(self) -> None:
+        """Block until everything submitted so far is committed."""
+        self._queue.join()
+
+    def close(self) -> None:
+        if not self._thread.is_alive():
+            return
+        self._queue.put(_STOP)
+        self._thread.join()
+        self._conn.close()
+        atexit.unregister(self.close)
+
+    def _run(self) -> None:
+        while True:
+            batch: List = [self._queue.get()]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            stop = _STOP in batch
+            rows = [r for r in batch if r is not _STOP]
+            try:
+                if rows:
+                    self._write(rows)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+            if stop:
+                return
+
+    def _write(self, rows: List) -> None:
+        for delay in RETRY_DELAYS + (None,):
+            try:
+                with self._conn:                           # one transaction per batch
+                    self._conn.executemany(_INSERT, rows)
+                self.written += len(rows)
+                return
+            except sqlite3.Error as exc:                   # locked, disk full, table gone ...
+                self.last_error = exc
+                if delay is None:
+                    break
+                time.sleep(delay)
+                try:
+                    self._conn.execute(SCHEMA)             # recreate the table if it went away
+                except sqlite3.Error:
+                    pass
+        self.failed += len(rows)
+        print(f"chakra_insight.store: lost {len(rows)} session(s) writing {self.path}: {self.last_error}",
+              file=sys.stderr)
+
+
+def read_sessions(path: str = DEFAULT_PATH, after_id: int = 0, limit: Optional[int] = None) -> Iterable[Dict]:
+    """Stored sessions with ``id > after_id`` as dicts, answers and posterior decoded."""
+    conn = connect(path)
+    try:
+        sql = f"SELECT id, {', '.join(COLUMNS)} FROM sessions WHERE id > ? ORDER BY id"
+        params: Tuple = (after_id,)
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        for row in conn.execute(sql, params):
+            rec = dict(zip(("id",) + COLUMNS, row))
+            rec["answers"] = [tuple(a) for a in json.loads(rec["answers"])]
+            rec["posterior"] = json.loads(rec["posterior"])
+            yield rec
+    finally:
+        conn.close()
@@ -0,0 +1,142 @@
+"""Analytics over the stored session history.
+
+Reads the incremental rollup (``chakra_insight.analytics``): each visit costs one
+``MAX(id)`` lookup, and the rollup and charts are recomputed only when new sessions
+have arrived since the cached result. Set ``CHAKRA_ADMIN_PASSWORD`` to put the page
+behind a password.
+"""
+import hmac
+import io
+import os
+
+import numpy as np
+import streamlit as st
+from matplotlib.figure import Figure
+
+from chakra_insight import engine
+from chakra_insight.analytics import latest_id, refresh
+from chakra_insight.engine import ANSWERS, STOP_THRESHOLD
+from chakra_insight.knowledge import CHAKRAS, CHAKRA_COLORS
+from chakra_insight.store import DEFAULT_PATH
+
+st.set_page_config(page_title="Chakra Insight · Analytics", page_icon="📊", layout="wide")
+
+PASSWORD = os.environ.get("CHAKRA_ADMIN_PASSWORD")
+if PASSWORD and not st.session_state.get("admin"):
+    entered = st.text_input("Admin password", type="password")
+    if not entered:
+        st.stop()
+    if not hmac.compare_digest(entered.encode(), PASSWORD.encode()):
+        st.error("Wrong password.")
+        st.stop()
+    st.session_state.admin = True
+
+SHORT = [c.split(" (")[0] for c in CHAKRAS]
+COLORS = [CHAKRA_COLORS[c] for c in CHAKRAS]
+ANSWER_COLORS = ("#43A047", "#E53935", "#BDBDBD")
+
+
+def _png(fig: Figure) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=110, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def _charts(r) -> dict:
+    """PNG bytes of every chart for one rollup state."""
+    charts = {}
+
+    fig = Figure(figsize=(6, 3.2))
+    ax = fig.subplots()
+    ax.bar(SHORT, r.winners, color=COLORS)
+    ax.set_ylabel("sessions")
+    ax.tick_params(axis="x", labelrotation=30)
+    charts["winners"] = _png(fig)
+
+    fig = Figure(figsize=(6, 3.2))
+    ax = fig.subplots()
+    edges = np.linspace(0, 1, len(r.confidence) + 1)
+    ax.bar(edges[:-1], r.confidence, width=np.diff(edges), align="edge", color="#5E35B1", edgecolor="white")
+    ax.axvline(STOP_THRESHOLD, color="black", linestyle="--", linewidth=1)
+    ax.set_xlabel("winner probability")
+    ax.set_ylabel("sessions")
+    charts["confidence"] = _png(fig)
+
+    fig = Figure(figsize=(6, 3.2))
+    ax = fig.subplots()
+    n = np.arange(len(r.questions))
+    ax.bar(n, r.reached, color="#43A047", label=f"reached {STOP_THRESHOLD:.0%}")
+    ax.bar(n, r.questions - r.reached, bottom=r.reached, color="#BDBDBD", label="did not")
+    ax.set_xlabel("questions asked")
+    ax.set_ylabel("sessions")
+    ax.legend(frameon=False)
+    charts["questions"] = _png(fig)
+
+    fig = Figure(figsize=(6, 0.3 * len(engine.QUESTION_IDS) + 1))
+    ax = fig.subplots()
+    totals = r.answers.sum(axis=1, keepdims=True)
+    rates = np.divide(r.answers, totals, out=np.zeros(r.answers.shape), where=totals > 0)
+    left = np.zeros(len(rates))
+    for k, (label, color) in enumerate(zip(ANSWERS, ANSWER_COLORS)):
+        ax.barh(engine.QUESTION_IDS, rates[:, k], left=left, color=color, label=label)
+        left += rates[:, k]
+    ax.invert_yaxis()
+    ax.set_xlim(0, 1)
+    ax.legend(frameon=False, ncol=3, loc="lower center", bbox_to_anchor=(0.5, 1.0))
+    charts["answers"] = _png(fig)
+
+    fig = Figure(figsize=(5, 4.2))
+    ax = fig.subplots()
+    rows = r.birth.sum(axis=1, keepdims=True)
+    share = np.divide(r.birth, rows, out=np.zeros(r.birth.shape), where=rows > 0)
+    im = ax.imshow(share, cmap="Purples", vmin=0, vmax=max(share.max(), 1e-9))
+    ax.set_xticks(range(len(SHORT)), SHORT, rotation=45, ha="right")
+    ax.set_yticks(range(len(SHORT)), SHORT)
+    ax.set_xlabel("quiz winner")
+    ax.set_ylabel("birth chakra")
+    fig.colorbar(im, ax=ax, fraction=0.046, label="share of birth chakra")
+    charts["birth"] = _png(fig)
+    return charts
+
+
+@st.cache_data(max_entries=4, show_spinner="Updating analytics…")
+def load(db: str, upto: int):
+    """Rollup summary and charts as of session ``upto``; cached until new sessions arrive."""
+    rollup = refresh(db, upto=upto)
+    return rollup.summary(), _charts(rollup)
+
+
+st.title("📊 Session analytics")
+db = DEFAULT_PATH
+if not os.path.exists(db):
+    st.info("No sessions stored yet.")
+    st.stop()
+summary, charts = load(db, latest_id(db))
+if not summary["sessions"]:
+    st.info("No sessions stored yet.")
+    st.stop()
+
+c1, c2, c3, c4 = st.columns(4)
+c1.metric("Sessions", f"{summary['sessions']:,}")
+c2.metric(f"Reached {STOP_THRESHOLD:.0%}", f"{summary['reached_threshold']:.1%}")
+avg = summary["avg_questions_to_threshold"]
+c3.metric("Questions to threshold", f"{avg:.1f}" if avg is not None else "–")
+agree = summary["birth_agreement"]
+c4.metric("Birth chakra = winner", f"{agree:.1%}" if agree is not None else "–",
+          help=f"over {summary['sessions_with_dob']:,} sessions with a date of birth; chance is {1 / len(CHAKRAS):.1%}")
+
+left, right = st.columns(2)
+with left:
+    st.subheader("Winning chakra")
+    st.image(charts["winners"])
+    st.subheader("Questions asked")
+    st.image(charts["questions"])
+    st.subheader("Birth chakra × winner")
+    st.image(charts["birth"])
+with right:
+    st.subheader("Confidence")
+    st.image(charts["confidence"])
+    st.subheader("Answers per question")
+    st.image(charts["answers"])
+
+st.caption(f"Up to session #{summary['watermark']:,} · {db}")
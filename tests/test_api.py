@@ -0,0 +1,31 @@
+import asyncio
+import json
+
+from chakra_insight.api import app
+
+
+def _post(path, body):
+    sent = []
+    messages = [{"type": "http.request", "body": body, "more_body": False}]
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    scope = {"type": "http", "method": "POST", "path": path, "query_string": b""}
+    asyncio.run(app(scope, receive, send))
+    return sent[0]["status"], json.loads(sent[1]["body"])
+
+
+def test_answer_rejects_non_object_body():
+    for body in (b"[1]", b'"x"', b"3", b"null"):
+        status, data = _post("/answer", body)
+        assert status == 400, body
+        assert "error" in data
+
+
+def test_answer_rejects_non_string_fields():
+    status, _ = _post("/answer", json.dumps({"token": 5, "answer": ["Yes"]}).encode())
+    assert status == 400
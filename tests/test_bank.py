@@ -0,0 +1,44 @@
+import os
+import struct
+import subprocess
+import sys
+
+import pytest
+
+from chakra_insight.bank import BankError, builtin_source, compile_bank, load_compiled
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@pytest.fixture
+def compiled(tmp_path):
+    path = str(tmp_path / "bank.ckb")
+    compile_bank(builtin_source(), path)
+    return path
+
+
+def test_round_trip(compiled):
+    bank = load_compiled(compiled)
+    assert bank.likelihoods.shape == (7, len(bank.question_ids))
+    assert not bank.likelihoods.flags.writeable
+
+
+def test_header_fields_are_covered_by_the_digest(compiled):
+    with open(compiled, "r+b") as fh:
+        fh.seek(16)                                   # n_questions (<8sIII...)
+        n = struct.unpack("<I", fh.read(4))[0]
+        fh.seek(16)
+        fh.write(struct.pack("<I", n // 2))
+    with pytest.raises(BankError, match="checksum"):
+        load_compiled(compiled)
+
+
+def test_engine_uses_the_mapped_matrix(compiled):
+    code = ("from chakra_insight import engine, knowledge\n"
+            "from chakra_insight.calibrate import handset_matrix\n"
+            "engine.set_likelihoods(handset_matrix())\n"
+            "import numpy as np\n"
+            "assert not engine.LIKE.flags.owndata\n"
+            "assert np.shares_memory(engine.LIKE, knowledge.LIKELIHOOD_MATRIX)\n")
+    env = dict(os.environ, CHAKRA_BANK=compiled, PYTHONPATH=ROOT)
+    subprocess.run([sys.executable, "-c", code], env=env, check=True)
@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from chakra_insight.batch import OUTPUT_COLUMNS, score_file
+
+
+def _csv_with_late_dobs(path):
+    path.write_text("id,safety_finance,dob\n"
+                    "1,Yes,\n"
+                    "2,No,\n"
+                    "3,Yes,1990-01-05\n"
+                    "4,Not sure,1985-07-20\n", encoding="utf-8")
+
+
+def test_parquet_schema_is_fixed_across_chunks(tmp_path):
+    pq = pytest.importorskip("pyarrow.parquet")
+    src, dest = tmp_path / "in.csv", tmp_path / "out.parquet"
+    _csv_with_late_dobs(src)
+    assert score_file(str(src), str(dest), chunksize=2) == 4
+    table = pq.read_table(dest)
+    assert table.column_names == list(OUTPUT_COLUMNS)
+    births = table.column("birth_chakra").to_pylist()
+    assert births[:2] == [None, None] and all(births[2:])
+    assert table.column("name").to_pylist() == [None] * 4
+
+
+def test_csv_columns_stay_aligned_when_a_column_appears_late(tmp_path):
+    import pandas as pd
+
+    src, dest = tmp_path / "in.jsonl", tmp_path / "out.csv"
+    rows = [{"id": 1, "answers": {"safety_finance": "Yes"}},
+            {"id": 2, "answers": {"safety_finance": "No"}},
+            {"id": 3, "name": "x", "answers": {"safety_finance": "Yes"}}]
+    src.write_text("\n".join(json.dumps(r) for r in rows) + "\n", encoding="utf-8")
+    assert score_file(str(src), str(dest), chunksize=2) == 3
+    out = pd.read_csv(dest, dtype=str, keep_default_na=False)
+    assert list(out.columns) == list(OUTPUT_COLUMNS)
+    assert out["name"].tolist() == ["", "", "x"]
+    assert out["winner"].str.contains("(", regex=False).all()
+    assert out["id"].tolist() == ["1", "2", "3"]
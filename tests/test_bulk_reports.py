@@ -0,0 +1,17 @@
+import json
+import os
+
+from chakra_insight.bulk_reports import render_all
+
+
+def test_bad_record_does_not_abort_the_cohort(tmp_path, capsys):
+    src = tmp_path / "cohort.jsonl"
+    records = [{"id": "a", "name": "Asha", "dob": "1990-04-12", "answers": {"safety_finance": "Yes"}},
+               {"id": "b", "name": "Bad", "dob": "01/02/1990", "answers": {"safety_finance": "No"}},
+               {"id": "c", "name": "Chen", "answers": {"safety_finance": "Unsure"}}]
+    src.write_text("\n".join(json.dumps(r) for r in records), encoding="utf-8")
+    out = tmp_path / "out"
+    stats = render_all(str(src), str(out), workers=2)
+    assert stats["reports"] == 2 and stats["failed"] == 1
+    assert sorted(os.listdir(out)) == ["a_Asha.pdf", "c_Chen.pdf"]
+    assert "record b: ValueError" in capsys.readouterr().err
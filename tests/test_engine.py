@@ -0,0 +1,36 @@
+import sys
+import threading
+
+import numpy as np
+
+from chakra_insight import engine
+
+
+def test_readers_never_mix_two_likelihood_matrices():
+    original = engine.LIKE
+    other = 0.5 * original + 0.2
+    p = engine.uniform_vector()
+    expected = []
+    for like in (original, other):
+        engine.set_likelihoods(like)
+        expected.append(engine.information_gains(p))
+    stop = threading.Event()
+
+    def swap():
+        while not stop.is_set():
+            engine.set_likelihoods(other)
+            engine.set_likelihoods(original)
+
+    interval = sys.getswitchinterval()
+    sys.setswitchinterval(1e-6)                      # switch threads as often as possible
+    t = threading.Thread(target=swap)
+    t.start()
+    try:
+        for _ in range(2000):
+            gains = engine.information_gains(p)
+            assert any(np.array_equal(gains, e) for e in expected)
+    finally:
+        stop.set()
+        t.join()
+        sys.setswitchinterval(interval)
+        engine.set_likelihoods(original)
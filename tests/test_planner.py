@@ -0,0 +1,35 @@
+import threading
+import time
+
+import numpy as np
+
+from chakra_insight import engine
+from chakra_insight.planner import Planner
+
+
+def test_budget_holds_with_threads_sharing_a_planner():
+    planner = Planner(depth=8, budget_s=0.005, memo_size=50)
+    p = engine.uniform_vector()
+    errors, elapsed = [], []
+
+    def work(seed):
+        rng = np.random.default_rng(seed)
+        try:
+            for _ in range(20):
+                asked = rng.choice(len(engine.QUESTION_IDS), 3, replace=False).tolist()
+                history = [(q, int(rng.integers(3))) for q in asked]
+                t0 = time.perf_counter()
+                q = planner.choose(p, asked, history)
+                elapsed.append(time.perf_counter() - t0)
+                assert q is not None and q not in asked
+        except Exception as exc:          # surfaced below
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work, args=(i,)) for i in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=30)
+    assert not any(t.is_alive() for t in threads)
+    assert not errors
+    assert max(elapsed) < 1.0
@@ -0,0 +1,19 @@
+import pytest
+
+from chakra_insight.engine import STOP_THRESHOLD
+from chakra_insight.policy import PolicyTree, load_default
+from chakra_insight.session import Engine
+
+
+def test_policy_for_another_threshold_is_rejected(tmp_path):
+    path = str(tmp_path / "policy.npz")
+    PolicyTree.compile(max_depth=2, stop_threshold=0.3).save(path)
+    with pytest.raises(ValueError, match="stop threshold"):
+        PolicyTree.load(path)
+    assert PolicyTree.load(path, stop_threshold=0.3).stop_threshold == 0.3
+    assert load_default(path).stop_threshold == STOP_THRESHOLD
+
+
+def test_engine_rejects_mismatched_policy():
+    with pytest.raises(ValueError):
+        Engine(PolicyTree.compile(max_depth=1, stop_threshold=0.3))
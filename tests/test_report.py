@@ -0,0 +1,73 @@
+import threading
+import time
+
+from chakra_insight import report, report_queue
+from chakra_insight.knowledge import CHAKRAS
+from chakra_insight.report import render_report
+from chakra_insight.report_queue import ReportCache, ReportQueue
+
+
+def test_concurrent_renders_share_the_template(monkeypatch):
+    monkeypatch.setenv("CHAKRA_LOGO", "")
+    monkeypatch.setenv("CHAKRA_OFFLINE", "1")
+    report.load_logo.cache_clear()
+    posterior = {c: (0.7 if i == 0 else 0.05) for i, c in enumerate(CHAKRAS)}
+    errors, sizes = [], []
+
+    def work():
+        try:
+            for _ in range(20):
+                pdf = render_report(posterior, "Asha", "asha@example.com", "1990-04-12")
+                assert pdf.startswith(b"%PDF-")
+                sizes.append(len(pdf))
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=work) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(60)
+    report.load_logo.cache_clear()
+    assert not errors
+    assert len(sizes) == 80 and len(set(sizes)) == 1
+
+
+def test_markup_in_typed_fields_is_escaped(monkeypatch):
+    monkeypatch.setenv("CHAKRA_LOGO", "")
+    monkeypatch.setenv("CHAKRA_OFFLINE", "1")
+    report.load_logo.cache_clear()
+    posterior = {c: 1 / len(CHAKRAS) for c in CHAKRAS}
+    pdf = render_report(posterior, "x<b> & <i>co", "a<b>@example.com", "1990-04-12")
+    report.load_logo.cache_clear()
+    assert pdf.startswith(b"%PDF-")
+
+
+def test_failed_job_is_kept_until_retried(tmp_path, monkeypatch):
+    calls = []
+
+    def fail(fh, *args):
+        calls.append(args)
+        raise ValueError("boom")
+
+    monkeypatch.setattr(report_queue, "write_report", fail)
+    monkeypatch.setattr(report_queue, "load_logo", lambda: None)
+    queue = ReportQueue(ReportCache(str(tmp_path)), workers=1)
+    posterior = {c: 1 / len(CHAKRAS) for c in CHAKRAS}
+    job = queue.submit(posterior, "Asha")
+    _wait(job)
+    assert job.state == report_queue.FAILED and "boom" in job.error
+    for _ in range(3):
+        assert queue.submit(posterior, "Asha") is job
+    assert len(calls) == 1
+    again = queue.submit(posterior, "Asha", retry=True)
+    assert again is not job
+    _wait(again)
+    assert len(calls) == 2
+
+
+def _wait(job):
+    deadline = time.monotonic() + 10
+    while not job.finished and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert job.finished
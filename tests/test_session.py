@@ -0,0 +1,36 @@
+from chakra_insight import engine as quiz
+from chakra_insight.policy import PolicyTree
+from chakra_insight.session import Engine
+
+
+def test_repeated_and_late_answers_are_ignored():
+    engine = Engine()
+    s = engine.new_session()
+    q = engine.next_question(s)
+    assert engine.answer(s, q, "Yes")
+    posterior = s.posterior.copy()
+    assert not engine.answer(s, q, "Yes")           # double click on the same question
+    assert s.n == 1 and (s.posterior == posterior).all()
+
+    while not engine.finished(s):
+        engine.answer(s, engine.next_question(s), "Not sure")
+    n = s.n
+    for qidx in range(len(engine.question_ids)):     # clicks after the session is over
+        assert not engine.answer(s, qidx, "No")
+    assert s.n == n
+
+
+def test_reruns_past_the_compiled_depth_use_the_policy_cache(monkeypatch):
+    engine = Engine(PolicyTree.compile(max_depth=2))
+    s = engine.new_session()
+    for _ in range(4):
+        engine.answer(s, engine.next_question(s), "Not sure")
+    calls = []
+    best = quiz.best_question
+    monkeypatch.setattr(quiz, "best_question", lambda *a: calls.append(a) or best(*a))
+    q = engine.next_question(s)
+    n = len(calls)
+    assert n
+    for _ in range(5):                               # reruns of the same question panel
+        assert engine.next_question(s) == q
+    assert len(calls) == n
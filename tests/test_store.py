@@ -0,0 +1,38 @@
+import sqlite3
+
+from chakra_insight import store
+from chakra_insight.store import SessionStore, make_record, read_sessions
+
+
+def _record(i):
+    return make_record([("safety_finance", "Yes")], {"Root (Muladhara)": 0.9, "Crown (Sahasrara)": 0.1},
+                       name=f"user {i}")
+
+
+def test_failed_batch_does_not_poison_the_store(tmp_path, monkeypatch):
+    monkeypatch.setattr(store, "RETRY_DELAYS", ())
+    path = str(tmp_path / "sessions.db")
+    s = SessionStore(path)
+    try:
+        assert s.submit(_record(1))
+        s.flush()
+        assert s.written == 1
+
+        conn = sqlite3.connect(path)
+        conn.execute("DROP TABLE sessions")
+        conn.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY)")      # wrong columns
+        conn.commit()
+        assert s.submit(_record(2))
+        s.flush()
+        assert s.failed == 1 and s.last_error is not None
+
+        conn.execute("DROP TABLE sessions")
+        conn.execute(store.SCHEMA)
+        conn.commit()
+        conn.close()
+        assert s.submit(_record(3))                  # still accepted after the failure
+        s.flush()
+        assert s.written == 2
+    finally:
+        s.close()
+    assert [r["name"] for r in read_sessions(path)] == ["user 3"]